@@ -0,0 +1,148 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from sudoku import LEVELS, SOLVERS, validation, generate_Sudoku, make_Puzzle, solve, count_Solutions, parse_Line
+from sudoku import Board, validate_Boards, transform_Puzzle, canonical_Key
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Well-known hard puzzles (all with a unique solution) used as the solver corpus.
+HARD_PUZZLES = [
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9",
+    "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    "6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....",
+    "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....",
+    "....14....3....2...7..........9...3.6.1.............8.2.....1.4....5.6.....7.8...",
+    "85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4.",
+    "..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..",
+    "12.3....435....1....4........54..2..6...7.........8.9...31..5.......9.7.....6...8",
+]
+data = [
+    [5, 3, None, None, 7, None, None, None, None],
+    [6, None, None, 1, 9, 5, None, None, None],
+    [None, 9, 8, None, None, None, None, 6, None],
+    [8, None, None, None, 6, None, None, None, 3],
+    [4, None, None, 8, None, 3, None, None, 1],
+    [7, None, None, None, 2, None, None, None, 6],
+    [None, 6, None, None, None, None, 2, 8, None],
+    [None, None, None, 4, 1, 9, None, None, 5],
+    [None, None, None, None, 8, None, None, 7, 9],
+]
+
+def measure(func, samples: int, inner: int = 1) -> dict:
+    """
+    Times `func` and summarizes the per-call latency.
+
+    Args:
+        func: The function to time, called without arguments.
+        samples (int): The number of timed samples.
+        inner (int): The number of calls per sample, for functions too fast to time one by one.
+
+    Returns:
+        dict: The number of samples and the mean, p50 and p99 per-call latency in milliseconds.
+    """
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(inner):
+            func()
+        times.append((time.perf_counter() - start) * 1000 / inner)
+    times.sort()
+    return {"samples": samples,
+            "mean_ms": statistics.fmean(times),
+            "p50_ms": times[len(times) // 2],
+            "p99_ms": times[min(len(times) - 1, round(len(times) * 0.99))]}
+
+def run_Benchmarks(seed: int = 0, samples: int = 50) -> dict:
+    """
+    Runs every benchmark with a fixed seed.
+
+    Args:
+        seed (int): The seed of the global random generator, reset before each benchmark.
+        samples (int): The number of samples per benchmark.
+
+    Returns:
+        dict: The run metadata and one latency summary per benchmark name.
+    """
+    results = {}
+    random.seed(seed)
+    results["validation"] = measure(lambda: validation(data, 1, 0, 2), samples, inner=1000)
+    random.seed(seed)
+    results["generate_Sudoku"] = measure(lambda: generate_Sudoku([[None]*9 for _ in range(9)]), samples)
+    for level in LEVELS:
+        random.seed(seed)
+        results[f"make_Puzzle[{level}]"] = measure(lambda: make_Puzzle(level), samples)
+    for box in (4, 5):
+        for level in LEVELS:
+            results[f"make_Puzzle[{level},{box * box}x{box * box}]"] = measure(
+                lambda: make_Puzzle(level, box=box, seed=seed), max(1, samples // (10 if box == 4 else 25)))
+    random.seed(seed)
+    solution, puzzle, location = make_Puzzle("Expert", seed=seed)
+    results["transform_Puzzle[Expert]"] = measure(lambda: transform_Puzzle(solution, puzzle), samples, inner=100)
+    results["canonical_Key[Expert]"] = measure(lambda: canonical_Key(transform_Puzzle(solution, puzzle)[1]), samples)
+    boards = [parse_Line(line) for line in HARD_PUZZLES]
+    for index, board in enumerate(boards):
+        results[f"solve[hard-{index}]"] = measure(lambda: solve(board), max(1, samples // 10))
+    # the same operations on every other solver backend, for comparison with the default one
+    for solver in list(SOLVERS)[1:]:
+        random.seed(seed)
+        results[f"generate_Sudoku[{solver}]"] = measure(lambda: generate_Sudoku([[None]*9 for _ in range(9)], solver), samples)
+        for index, board in enumerate(boards):
+            results[f"solve[{solver},hard-{index}]"] = measure(lambda: solve(board, solver), max(1, samples // 10))
+    for solver in SOLVERS:
+        results[f"count_Solutions[{solver},hard]"] = measure(
+            lambda: [count_Solutions(board, solver=solver) for board in boards], max(1, samples // 10))
+    random.seed(seed)
+    grids = []
+    for _ in range(100):
+        grid = [[None]*9 for _ in range(9)]
+        generate_Sudoku(grid)
+        grids.append(grid)
+    results["validate[python,10000]"] = measure(
+        lambda: [all(mask == board.full for mask in board.rows + board.cols + board.boxes)
+                 for board in map(Board, grids * 100)], max(1, samples // 10))
+    if numpy is not None:
+        boards = numpy.array(grids * 100, dtype=numpy.uint8)
+        results["validate_Boards[10000]"] = measure(lambda: validate_Boards(boards), max(1, samples // 10))
+    return {"python": platform.python_version(), "seed": seed, "samples": samples, "results": results}
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Returns a line per benchmark whose mean got slower than `threshold` times the baseline."""
+    slower = []
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old and result["mean_ms"] > old["mean_ms"] * threshold:
+            slower.append(f"{name}: {old['mean_ms']:.3f}ms -> {result['mean_ms']:.3f}ms")
+    return slower
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for the SUDOKU generator and solver.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--output", default="-", help="JSON result file ('-' for stdout)")
+    parser.add_argument("--baseline", help="JSON result file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    report = run_Benchmarks(args.seed, args.samples)
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    if args.baseline:
+        with open(args.baseline) as file:
+            slower = compare(report, json.load(file), args.threshold)
+        for line in slower:
+            print(f"regression {line}", file=sys.stderr)
+        sys.exit(1 if slower else 0)
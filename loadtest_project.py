@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from sudoku import LEVELS, LatencyStats
+from sudoku.server import PuzzleServer, fetch
+
+async def run_Client(host: str, port: int, rounds: int, level: str, stats: dict, errors: list):
+    """
+    Plays `rounds` games over one keep-alive connection: fetch a puzzle, solve it, check a 
+    half-filled board and ask for a hint, timing every request in `stats` by endpoint and 
+    appending the responses that are not 200 to `errors`.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def call(method: str, path: str, payload: dict = None) -> dict:
+        start = time.perf_counter()
+        status, data = await fetch(reader, writer, method, path, payload)
+        stats[path.split("?")[0]].add(time.perf_counter() - start)
+        if status != 200:
+            errors.append((path, status, data))
+        return data
+
+    try:
+        for _ in range(rounds):
+            puzzle = await call("GET", f"/puzzle?level={level}")
+            solution = (await call("POST", "/solve", {"puzzle": puzzle["puzzle"]}))["solution"]
+            board = "".join(solution[i] if ch == "." and random.random() < 0.5 else ch
+                            for i, ch in enumerate(puzzle["puzzle"]))
+            await call("POST", "/check", {"id": puzzle["id"], "board": board})
+            await call("POST", "/hint", {"id": puzzle["id"], "board": board})
+    finally:
+        writer.close()
+
+async def run_Load(host: str, port: int, clients: int, rounds: int, level: str, workers: int) -> dict:
+    """
+    Runs `clients` concurrent clients against a server, starting a local one when `port` is 0.
+
+    Returns:
+        dict: The run settings, the throughput, the number of failed requests and the client-side 
+              and server-side latency summaries.
+    """
+    server = None
+    if port == 0:
+        server = PuzzleServer(workers)
+        listener = await server.start(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+    stats = {path: LatencyStats() for path in ("/puzzle", "/solve", "/check", "/hint")}
+    errors = []
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(run_Client(host, port, rounds, level, stats, errors) for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+        reader, writer = await asyncio.open_connection(host, port)
+        metrics = (await fetch(reader, writer, "GET", "/metrics"))[1]
+        writer.close()
+    finally:
+        if server is not None:
+            await server.stop()
+    requests = sum(summary.count for summary in stats.values())
+    return {"clients": clients, "rounds": rounds, "level": level, "seconds": elapsed,
+            "requests_per_second": requests / elapsed, "errors": len(errors),
+            "client": {path: summary.summary() for path, summary in stats.items()}, "server": metrics}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the SUDOKU puzzle server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="port of a running server (0 starts one)")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=25, help="games played by each client")
+    parser.add_argument("--level", choices=list(LEVELS), default="Easy")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes of a started server")
+    args = parser.parse_args()
+    report = asyncio.run(run_Load(args.host, args.port, args.clients, args.rounds, args.level, args.workers))
+    print(json.dumps(report, indent=2))
@@ -1,7 +1,20 @@
 from tkinter import *
-import random
-
-def main():
+from tkinter import messagebox
+import os
+import types
+from sudoku import *
+from sudoku import UNIT_CELLS
+
+Puzzle_pool = None
+Renderer = "widgets"  # "widgets" (one Label/Entry per cell) or "canvas" (a single CanvasBoard)
+Board_canvas = None
+Board_box = 3  # side of a box: 3 for 9x9, 4 for 16x16, 5 for 25x25
+Game_state = None
+Pending_level = None  # level whose puzzle `poll_Puzzle` waits for
+POLL_MS = 50  # delay between two polls of `Puzzle_pool` while it builds a puzzle
+SESSION_FILE = os.path.join(os.path.expanduser("~"), ".sudoku_sessions")
+
+def main(renderer: str = "widgets", box: int = 3):
     """
     Initializes the Tkinter window for the Sudoku game.
 
@@ -9,73 +22,273 @@ def main():
     and calls the `select_Level` function to display the level selection menu. It then 
     enters the Tkinter main event loop.
 
+    Args:
+        renderer (str): "widgets" to draw each cell as its own Label/Entry, or "canvas" to draw
+                        the whole grid on a single `CanvasBoard`.
+        box (int): The side of a box: 3 for 9x9, 4 for 16x16 or 5 for 25x25 boards.
+
     Global Variables:
         - root: The main Tkinter window object.
+        - Puzzle_pool: The `PuzzlePool` refilled in the background while the window is open.
+        - Renderer: The renderer used for the grid.
+        - Board_box: The side of a box of the boards played.
     """
-    global root
+    global root, Puzzle_pool, Renderer, Board_box
+    Renderer = renderer
+    Board_box = box
     root = Tk()
     root.title("SUDOKU")
-    root.geometry("550x400")                                                                                                                                                                                                                                                                                
+    root.protocol("WM_DELETE_WINDOW", on_Close)
+    if box == 3:
+        root.geometry("550x430")                                                                                                                                                                                                                                                                                
+    use_Pool(box)
     select_Level(Frame(root))
     root.mainloop()
+    Puzzle_pool.stop(wait=False)  # the daemon thread may be building a puzzle: don't wait for it
 
-def validation(data: list, n: int, row: int, col: int) -> bool:
+def use_Pool(box: int):
     """
-    Validates whether a number can be placed at a specific cell of the Sudoku grid.
-
-    This function checks if the number `n` can be placed at the given location (row, col)                                                                                                                                                       
-    in the `data` grid. It verifies that `n` does not already exist in the current row, 
-    column, or the 3x3 subgrid.
+    Makes `Puzzle_pool` build boards with boxes of side `box`, replacing a pool of another size.
 
-    Args:
-        data (list): A 9x9 list representing the Sudoku board.
-        n (int): The number to placed in the grid.
-        row (int): The row index where the number is to be placed.
-        col (int): The column index where the number is to be placed.
-
-    Returns:
-        bool: True if the number can be placed, False otherwise.
-    """
-    if n in data[row]:
-        return False
-    if n in [data[r][col] for r in range(9)]:
-        return False
-    row_sub = (row//3)*3
-    col_sub = (col//3)*3
-    for r in range(row_sub, row_sub + 3):
-        for c in range(col_sub, col_sub + 3):
-            if data[r][c] == n:
-                return False
-    return True
-
-def generate_Sudoku(data: list) -> bool:
-    """
-    Generate a valid Sudoku board using backtracking.
-
-    This function attempts to fill the empty cells in the `data` grid with numbers 
-    from 1 to 9 using backtracking. It calls the `validation` function to ensure 
-    that any number placed does not violate Sudoku rules. If a placement leads to a 
-    valid solution, it returns True; otherwise, it backtracks.
-
-    Args:
-        data (list): A 9x9 list representing the Sudoku grid (with None for empty cells).
-
-    Returns:
-        bool: True if the grid is successfully filled, False if no valid placement is possible.
-    """
-    for row in range(9):
-        for col in range(9):
-            if data[row][col] is None: # Empty Cell
-                nums = list(range(1,10))
-                random.shuffle(nums)
-                for n in nums:
-                    if validation(data, n, row, col):
-                        data[row][col] = n
-                        if generate_Sudoku(data):
-                            return True
-                        data[row][col] = None
-                return False
-    return True
+    Global Variables:
+        - Puzzle_pool: The `PuzzlePool` refilled in the background while the window is open.
+    """
+    global Puzzle_pool
+    if Puzzle_pool is not None and Puzzle_pool.box == box:
+        return
+    if Puzzle_pool is not None:
+        Puzzle_pool.stop(wait=False)
+    Puzzle_pool = PuzzlePool(box=box)
+    Puzzle_pool.start()
+
+class Highlighter:
+    """
+    Differential highlight manager for the cell widgets of the grid.
+
+    The manager remembers the (bg, fg, state) style it last sent to every cell. When the 
+    selection, a conflict or a mistake mark changes, it works out the target style of the cells 
+    that can be affected and sends a `config` call only to cells whose style actually differs, 
+    each at most once. `tk_calls` counts the calls sent in total and `last_calls` the calls sent
+    since the latest `begin`, which the event handlers call once per user interaction.
+
+    Attributes:
+        entries (list): A 2D list of widgets representing the cells in the grid.
+        base (list): A 2D list of the original (bg, fg, state) style of each cell.
+        shown (list): A 2D list of the style last sent to each cell.
+        state (GameState): The game whose digits and conflicts are highlighted.
+        peers (list): The `peers` table of `geometry`: the cells sharing a row, column or box with each cell.
+        selected (tuple): The selected (row, col) cell, or None.
+        selected_peers (set): The peers of the selected cell, highlighted with it.
+        marks (dict): The (bg, fg) mistake marks per cell, kept until the selection changes.
+        active (bool): False once the grid has been destroyed; all calls are then ignored.
+    """
+    def __init__(self, entries: list, base: list, state: GameState):
+        self.entries = entries
+        self.base = base
+        self.shown = [row[:] for row in base]
+        self.state = state
+        self.peers = geometry(state.box)["peers"]
+        self.selected = None
+        self.selected_peers = set()
+        self.marks = {}
+        self.active = True
+        self.tk_calls = 0
+        self.last_calls = 0
+        self._changed = set()  # cells whose shown style differs from their base style
+
+    def begin(self):
+        """Starts a new user interaction: `last_calls` counts the calls of every later `select`, `mark` or `update`."""
+        self.last_calls = 0
+
+    def select(self, cell: tuple):
+        """Moves the highlight to the row, column, box and equal digits of `cell` (None clears it)."""
+        dirty = self._changed | self.area(cell)
+        self.selected = cell
+        self.selected_peers = set(self.peers[cell[0]][cell[1]]) if cell is not None else set()
+        self.marks.clear()
+        self.update(dirty)
+
+    def mark(self, row: int, col: int, bg: str, fg: str):
+        """Marks a cell (for example as a mistake) until the selection changes."""
+        self.marks[(row, col)] = (bg, fg)
+        self.update({(row, col)})
+
+    def replace(self, row: int, col: int, style: tuple):
+        """Registers the widget that replaced `entries[row][col]` and its original style."""
+        self.base[row][col] = self.shown[row][col] = style
+        self._changed.discard((row, col))
+        self.update({(row, col)})
+
+    def area(self, cell: tuple) -> set:
+        """Returns the cells highlighted when `cell` is selected: its row, column, box and equal digits."""
+        if cell is None:
+            return set()
+        row, col = cell
+        cells = set(self.peers[row][col])
+        cells.add(cell)
+        n = self.state.player[row][col]
+        if n is not None:
+            cells |= self.state.cells_of(n)
+        return cells
+
+    def style(self, row: int, col: int) -> tuple:
+        """Returns the (bg, fg, state) a cell should show for the current selection, conflicts and marks."""
+        bg, fg, st = self.base[row][col]
+        if self.selected is not None:
+            sel_row, sel_col = self.selected
+            n = self.state.player[sel_row][sel_col]
+            if (row, col) == self.selected:
+                bg, fg, st = "lightblue", "magenta", "normal"
+            elif (row, col) in self.selected_peers:
+                bg, fg, st = "lightblue", "black", "normal"
+            elif n is not None and self.state.player[row][col] == n:
+                bg, fg, st = "lightblue", "magenta", "normal"
+        if (row, col) in self.state.conflicts:
+            fg = "red"
+        if (row, col) in self.marks:
+            bg, fg = self.marks[(row, col)]
+        return bg, fg, st
+
+    def update(self, cells):
+        """Sends a `config` call to each of `cells` whose target style differs from the shown one."""
+        if not self.active:
+            return
+        sent = 0
+        for (row, col) in cells:
+            target = self.style(row, col)
+            if target != self.shown[row][col]:
+                bg, fg, st = target
+                self.entries[row][col].config(bg=bg, fg=fg, state=st)
+                self.shown[row][col] = target
+                sent += 1
+                if target == self.base[row][col]:
+                    self._changed.discard((row, col))
+                else:
+                    self._changed.add((row, col))
+        self.last_calls += sent
+        self.tk_calls += sent
+
+class CanvasCell:
+    """
+    One cell of a `CanvasBoard`, with the widget methods the game uses on `entries`.
+
+    `config`, `cget`, `get`, `delete` and `insert` act on the cell's rectangle and text items, so
+    `Highlighter`, `on_entry` and the buttons work the same on both renderers.
+    """
+    def __init__(self, board: "CanvasBoard", rect: int, text: int):
+        self.board = board
+        self.rect = rect
+        self.text = text
+        self.editable = False
+        self.opts = {"background": None, "foreground": None, "state": "normal", "text": ""}
+
+    def config(self, **options):
+        for key, value in options.items():
+            key = {"bg": "background", "fg": "foreground"}.get(key, key)
+            if self.opts.get(key) == value:
+                continue
+            self.opts[key] = value
+            if key == "background":
+                self.board.canvas.itemconfig(self.rect, fill=value)
+            elif key == "foreground":
+                self.board.canvas.itemconfig(self.text, fill=value)
+            elif key == "text":
+                self.board.canvas.itemconfig(self.text, text=value)
+
+    def cget(self, key: str):
+        return self.opts[{"bg": "background", "fg": "foreground"}.get(key, key)]
+
+    def get(self) -> str:
+        return self.opts["text"]
+
+    def delete(self, first, last=None):
+        self.config(text="")
+
+    def insert(self, index, text: str):
+        self.config(text=self.opts["text"] + text)
+
+    def focus_set(self):
+        self.board.canvas.focus_set()
+
+    def winfo_exists(self) -> bool:
+        return self.board.canvas.winfo_exists()
+
+class CanvasBoard:
+    """
+    Grid renderer drawing all cells of the board on a single `Canvas`.
+
+    Each cell is a rectangle and a text item wrapped in a `CanvasCell`; the box lines are drawn
+    once. A single click handler and a single key handler serve the whole grid, and `load` 
+    reuses the existing items for a new game or a restart, changing only the items that differ.
+
+    Attributes:
+        canvas (Canvas): The canvas holding the grid.
+        cells (list): A 2D list of `CanvasCell` objects.
+        box (int): The side of a box (3, 4 or 5).
+        size (int): The side of the grid.
+    """
+    SIZE = 34  # cell size in pixels of a 9x9 board
+    SIZES = {3: SIZE, 4: 28, 5: 22}  # cell size in pixels per box side
+    FONTS = {3: ('Chewy', 15), 4: ('Chewy', 11), 5: ('Chewy', 9)}
+
+    def __init__(self, master, box: int = 3):
+        self.box, self.size = box, box * box
+        self.SIZE = self.SIZES[box]
+        side = self.size * self.SIZE
+        self.canvas = Canvas(master, width=side, height=side, bg="white", highlightthickness=0)
+        self.cells = [[None]*self.size for _ in range(self.size)]
+        for row in range(self.size):
+            for col in range(self.size):
+                x, y = col * self.SIZE, row * self.SIZE
+                rect = self.canvas.create_rectangle(x, y, x + self.SIZE, y + self.SIZE, outline="white")
+                text = self.canvas.create_text(x + self.SIZE // 2, y + self.SIZE // 2, font=self.FONTS[box])
+                self.cells[row][col] = CanvasCell(self, rect, text)
+        for i in range(0, self.size + 1, box):
+            self.canvas.create_line(i * self.SIZE, 0, i * self.SIZE, side, width=2)
+            self.canvas.create_line(0, i * self.SIZE, side, i * self.SIZE, width=2)
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Key>", self.on_key)
+
+    def load(self, data: list, location: list):
+        """Shows a new puzzle: given cells in black, the cells of `location` empty and editable."""
+        blanks = set(location)
+        for row in range(self.size):
+            for col in range(self.size):
+                cell = self.cells[row][col]
+                cell.editable = (row, col) in blanks
+                color_bg = "lightgrey" if (row//self.box + col//self.box)%2 == 0 else "white"
+                text = "" if cell.editable else str(data[row][col])
+                cell.config(text=text, bg=color_bg, fg="blue" if cell.editable else "black", state="normal")
+
+    def cell_at(self, x: int, y: int) -> tuple:
+        """Returns the (row, col) under canvas coordinates, or None outside the grid."""
+        row, col = y // self.SIZE, x // self.SIZE
+        return (row, col) if 0 <= row < self.size and 0 <= col < self.size else None
+
+    def on_click(self, event):
+        cell = self.cell_at(event.x, event.y)
+        if cell:
+            on_cell_click(event, *cell)
+
+    def on_key(self, event):
+        if selected_cell is None:
+            return
+        row, col = selected_cell
+        cell = self.cells[row][col]
+        if not cell.editable:
+            return
+        if event.char and event.char in "0123456789" and (event.char != "0" or cell.get()):
+            # on boards above 9x9 a second digit extends the number while it stays in range
+            text = cell.get() + event.char
+            if not text.isdigit() or int(text) > self.size:
+                text = event.char
+            cell.delete(0, END)
+            cell.insert(END, text)
+        elif event.keysym in ("BackSpace", "Delete") or event.char == "0":
+            cell.delete(0, END)
+        else:
+            return
+        on_entry(types.SimpleNamespace(widget=cell), row, col)
 
 def select_Level(frame: Frame):
     """
@@ -100,47 +313,82 @@ def select_Level(frame: Frame):
     level.menu.add_radiobutton(label="Medium", command=lambda: start_Game("Medium"))
     level.menu.add_radiobutton(label="Hard", command=lambda: start_Game("Hard"))
     level.menu.add_radiobutton(label="Expert", command=lambda: start_Game("Expert"))
+    level.menu.add_radiobutton(label="Resume", command=resume_Game)
     level.pack()
     Label_level = Label(frame,text="Choose level", padx=10, pady=5)
     Label_level.pack()
 
+@time_Call()
 def start_Game(level: str):
     """
-    Starts the Sudoku game and sets up the initial game configuration based on the level.
+    Starts a Sudoku game of the level chosen by the player.
 
-    This function sets up the number of hints and empty cells according to the player's chosen 
-    level. The `generate_sudoku` function is called to generate the puzzle grid and the solution,
-    setting up important global variables for data organization throughout the game. Then, 
-    the `GUI` function is called to display the game and the difficulty level.
+    The puzzle is taken from `Puzzle_pool` (rebuilt by `use_Pool` if `Board_box` changed) by 
+    `poll_Puzzle`, which never builds one on the Tk thread, or built by `make_Puzzle` when no pool
+    runs. `play_Puzzle` then sets up the game and displays it.
 
     Args:
         level (str): The selected difficulty level ("Easy", "Medium", "Hard", or "Expert").
 
     Global Variables:
-        - location: A list of coordinates representing the empty cells in the grid.
+        - Pending_level: The level whose puzzle is awaited; a later call replaces it.
+    """
+    global Pending_level
+    forget_Game()
+    Pending_level = level
+    if Puzzle_pool is not None:
+        use_Pool(Board_box)
+        poll_Puzzle(level)
+    else:
+        play_Puzzle(level, make_Puzzle(level, box=Board_box))
+
+def poll_Puzzle(level: str):
+    """
+    Plays the puzzle of `level` from `Puzzle_pool` as soon as it is ready.
+
+    When the pool has nothing to hand out yet, its refill thread builds the level first, and this
+    function shows "generating…" and checks again every `POLL_MS` milliseconds with `root.after`, 
+    so the window stays responsive. Choosing another level meanwhile drops the poll.
+
+    Args:
+        level (str): The selected difficulty level.
+    """
+    if level != Pending_level:
+        return
+    puzzle = Puzzle_pool.get(level, wait=False)
+    if puzzle is None:
+        Label_level.config(text="generating…")
+        root.after(POLL_MS, poll_Puzzle, level)
+        return
+    play_Puzzle(level, puzzle)
+
+def play_Puzzle(level: str, puzzle: tuple):
+    """
+    Sets up the game of a puzzle and displays it.
+
+    This function sets up the number of hints and empty cells according to the player's chosen
+    level, setting up important global variables for data organization throughout the game. 
+    Then, the `GUI` function is called to display the game and the difficulty level.
+
+    Args:
+        level (str): The difficulty level of the puzzle.
+        puzzle (tuple): The (solution, puzzle, location) of `make_Puzzle` or `PuzzlePool.get`.
+
+    Global Variables:
+        - location: The set of coordinates of the empty cells in the grid.
         - hint: The number of hints available based on the difficulty level.
         - Data_All: The fully solved Sudoku grid.
         - Data_Game: The initial Sudoku puzzle grid with some cells empty.
         - Data_Player: The grid containing the player's current progress.
+        - Game_state: The `GameState` tracking progress, digit counts and conflicts of `Data_Player`.
     """
     global Label_level, level_text
-    global location, hint, hint_or, Data_All, Data_Game, Data_Player
-    location = []
-    levels = {"Easy": {"location": 21, "hint": 2}, "Medium": {"location": 31, "hint": 3}, 
-              "Hard": {"location": 41, "hint": 4}, "Expert": {"location": 51, "hint": 5}}
-    num = random.randrange(levels[level]["location"],levels[level]["location"]+5,2)
-    hint, hint_or, level_text = levels[level]["hint"], levels[level]["hint"], level
-    Data_All = [[None]*9 for _ in range(9)]
-    generate_Sudoku(Data_All)
-    Data_Game = [row[:] for row in Data_All]
-    while len(location) < num:
-        r = random.randrange(9)
-        c = random.randrange(9)
-        if (r,c) not in location:
-            location.append((r,c))
-            Data_Game[r][c] = None
-    location = sorted(location)
-    Data_Player = [row[:] for row in Data_Game]
+    global location, hint, hint_or, Data_All, Data_Game, Data_Player, Game_state
+    hint, hint_or, level_text = LEVELS[level]["hint"], LEVELS[level]["hint"], level
+    Data_All, Data_Game, location = puzzle
+    location = set(location)
+    Game_state = GameState(Data_All, Data_Game, location)
+    Data_Player = Game_state.player
     GUI(Data_Game)
     Label_level.config(text=level)
 
@@ -152,6 +400,9 @@ def GUI(data: list):
     that includes the Sudoku grid and control buttons. The `grid_set_up` function is called to
     display the current state of the Sudoku puzzle and binds mouse events for user interaction. 
     It also creates buttons for checking the solution, restarting the game, and using hints.
+    With the canvas renderer, an existing window of the same board size is reused: only the grid
+    and the counters are reset. Otherwise the window is rebuilt and sized for the board of `data`,
+    so a resumed game of another size gets its own grid and number buttons.
 
     Args:
         data (list): The Sudoku grid to be displayed.
@@ -164,22 +415,42 @@ def GUI(data: list):
         - selected_cell: The currently selected cell in the Sudoku grid.
         - Button_hint: The button widget for using a hint.
         - Button_check: The button widget for checking the player's progress.
+        - Button_save: The button widget for saving the game (disabled once the game ends).
         - Button_nums: A list of button widgets for inputing numbers.
         - Label_mistake: A label displaying the number of mistakes.
         - Label_progress: A label displaying the player's progress in the game.
+        - Label_hint: A label under the grid explaining the last hint.
     """
     global Frame_grid, Frame_main
-    global hint, mistake, selected_cell, color_progress
-    global Button_hint, Button_check, Button_nums, Label_mistake, Label_progress
-
+    global hint, mistake, selected_cell, color_progress, color_mistake
+    global Button_hint, Button_check, Button_save, Button_nums, Label_mistake, Label_progress, Label_hint
+
+    box = grid_Box(data)
+    if (Renderer == "canvas" and Board_canvas is not None and Board_canvas.canvas.winfo_exists()
+            and Board_canvas.box == box):
+        mistake = 0
+        selected_cell = None
+        grid_set_up(data)
+        Label_mistake.config(text="mistake:0/3", fg=color_mistake)
+        Label_progress.config(text="progress:0%", fg=color_progress)
+        Label_hint.config(text="")
+        Button_check.config(state="normal")
+        Button_save.config(state="normal")
+        Button_hint.config(text=f"hint:{hint}", state="normal")
+        for Button_num in Button_nums:
+            Button_num.config(state="normal")
+        return
     for widget in root.winfo_children():
         widget.destroy()
+    root.geometry("550x430" if box == 3 else "")  # larger boards take their natural size
     color = "grey"
     Frame_main = Frame(root, bg=color)
     Frame_main.pack(padx=10, pady=10, fill=BOTH, expand=True)
     # title
     Label_Title = Label(Frame_main, text="LET'S PLAY SUDOKU", font=("Chalkboard", 25), justify="center", bg=color, fg="white")
     Label_Title.pack(side=TOP, pady=10)
+    Label_hint = Label(Frame_main, text="", font=("Times New Roman", 12), wraplength=500, bg=color, fg="white")
+    Label_hint.pack(side=BOTTOM)
     # Sudoku
     Frame_grid = Frame(Frame_main, borderwidth=10, relief="ridge", bg="white")
     Frame_grid.pack(side=LEFT, padx=20)
@@ -197,6 +468,7 @@ def GUI(data: list):
     Button_check = Button(Frame_buttons_buttons, text="check", command= button_Check)
     Button_check.pack()
     Label_mistake = Label(Frame_buttons_buttons, text="mistake:0/3", font=("Times New Roman",12))
+    color_mistake = Label_mistake.cget("foreground")
     Label_mistake.pack()
     Label_progress = Label(Frame_buttons_buttons, text="progress:0%", font=("Times New Roman",12))
     color_progress = Label_progress.cget("foreground")
@@ -205,12 +477,20 @@ def GUI(data: list):
     Button_restart.pack(side=LEFT, padx=5)
     Button_hint = Button(Frame_buttons_buttons, text=f"hint:{hint}", command= button_Hint)
     Button_hint.pack(padx=(0,5))
+    Frame_buttons_edit = Frame(Frame_buttons)
+    Frame_buttons_edit.pack(side=TOP, pady=(0,10))
+    Button(Frame_buttons_edit, text="undo", command=button_Undo).pack(side=LEFT)
+    Button(Frame_buttons_edit, text="redo", command=button_Redo).pack(side=LEFT)
+    Button_save = Button(Frame_buttons_edit, text="save", command=save_Game)
+    Button_save.pack(side=LEFT)
+    root.bind("<Control-z>", lambda e: button_Undo())
+    root.bind("<Control-y>", lambda e: button_Redo())
     Frame_buttons_num = Frame(Frame_buttons)
     Frame_buttons_num.pack(side=BOTTOM, pady=(0,10))
     Button_nums = []
-    for index, num in enumerate([i for i in range(1,10)]):
+    for index, num in enumerate([i for i in range(1, box*box + 1)]):
         Button_num = Button(Frame_buttons_num, text=str(num), command= lambda n = num: button_Number(n))
-        Button_num.grid(row = index//3, column=index%3)
+        Button_num.grid(row = index//box, column=index%box)
         Button_nums.append(Button_num)
 
 def grid_set_up(data: list):
@@ -221,6 +501,7 @@ def grid_set_up(data: list):
     (for pre-filled numbers) or an entry field (for user input). The provided `data` is used to
     set the initial values of the cells and binds events for user interaction. It also saves the 
     original background, foreground colors and state (noraml/disabled) for resetting purposes.
+    With the canvas renderer, the cells of `Board_canvas` are reused instead.
 
     Args:
         data (list): The Sudoku grid to be displayed.
@@ -230,16 +511,29 @@ def grid_set_up(data: list):
         - or_bg: A 2D list storing the original background color of each cell.
         - or_fg: A 2D list storing the original foreground color of each cell.
         - or_st: A 2D list storing the original state (normal/disabled) of each cell.
-    """
-    global Frame_grid, entries, or_bg, or_fg, or_st
-    or_bg = [[None]*9 for _ in range(9)]
-    or_fg = [[None]*9 for _ in range(9)]
-    or_st = [[None]*9 for _ in range(9)]
-    entries = [[None]*9 for _ in range(9)]
-    font = ('Chewy', 15)
-    for row in range(9):
-        for col in range(9):
-            color_bg = "lightgrey" if (row//3 + col//3)%2 == 0 else "white"
+        - Highlight: The `Highlighter` sending the highlight changes to the cells.
+        - Board_canvas: The `CanvasBoard` of the canvas renderer.
+    """
+    global Frame_grid, entries, or_bg, or_fg, or_st, Highlight, Board_canvas
+    size, box = len(data), grid_Box(data)
+    or_bg = [[None]*size for _ in range(size)]
+    or_fg = [[None]*size for _ in range(size)]
+    or_st = [[None]*size for _ in range(size)]
+    entries = [[None]*size for _ in range(size)]
+    font = CanvasBoard.FONTS[box]
+    if Renderer == "canvas":
+        if Board_canvas is None or not Board_canvas.canvas.winfo_exists() or Board_canvas.box != box:
+            Board_canvas = CanvasBoard(Frame_grid, box)
+            Board_canvas.canvas.pack()
+        Board_canvas.load(data, location)
+        entries = [row[:] for row in Board_canvas.cells]
+    for row in range(size):
+        for col in range(size):
+            if Renderer == "canvas":
+                cell = entries[row][col]
+                or_bg[row][col], or_fg[row][col], or_st[row][col] = cell.cget("bg"), cell.cget("fg"), cell.cget("state")
+                continue
+            color_bg = "lightgrey" if (row//box + col//box)%2 == 0 else "white"
             if (row,col) not in location:
                 cell = Label(Frame_grid, width=2, text=str(data[row][col]), font=font, justify='center', relief="flat", bg = color_bg, fg="black")
             else:
@@ -252,47 +546,56 @@ def grid_set_up(data: list):
             or_bg[row][col] = cell.cget("background")
             or_fg[row][col] = cell.cget("foreground")
             or_st[row][col] = cell.cget("state")
+    Highlight = Highlighter(entries, [[(or_bg[r][c], or_fg[r][c], or_st[r][c]) for c in range(size)] for r in range(size)], Game_state)
 
+@time_Call()
 def on_entry(event, row: int, col: int):  
     """
     Handles user input in the entry fields of the Sudoku grid.
 
     This function is triggered when a user types into an entry cell. If the input is valid 
-    (an integer between 1 and 9), it updates the `Data_Player` list and calls `button_Disable` 
-    to disable the corresponding number button if the maximum number of that value is reached. 
-    If the input is invalid, it resets the cell's value.
+    (an integer between 1 and the side of the grid), it updates `Game_state` (and so `Data_Player`) and calls 
+    `button_Disable` to disable the corresponding number button if the maximum number of that 
+    value is reached. If the input is invalid, it resets the cell's value. Conflicts with other
+    cells are shown as the player types.
 
     Args:
         event: The Tkinter event representing the player's key press.
         row (int): The row index of the selected cell.
         col (int): The column index of the selected cell.
     """
+    Highlight.begin()
     try:
         value = int(event.widget.get())
     except ValueError:
         old_value = Data_Player[row][col]
         if old_value:
-            Data_Player[row][col] = None
+            show_Conflicts(Game_state.play(row, col, None))
             button_Disable(old_value)
         event.widget.delete(0, END)
         return
-    if 1 <= value <= 9:
+    if 1 <= value <= Game_state.size:
         old_value = Data_Player[row][col]
-        Data_Player[row][col] = value
+        show_Conflicts(Game_state.play(row, col, value))
         button_Disable(value)
         if old_value:
             button_Disable(old_value)
     else:
         event.widget.delete(0, END)
-        Data_Player[row][col] = None
+        old_value = Data_Player[row][col]
+        show_Conflicts(Game_state.play(row, col, None))
+        if old_value:
+            button_Disable(old_value)
     
 
+@time_Call()
 def on_cell_click(event, row: int, col: int):
     """
     Handles the visual state of the Sudoku grid if user clicks a cell.
 
     This function highlights the clicked cell and its corresponding row, column, and 
-    3x3 sub-grid by changing their color. It also updates the `selected_cell` variable
+    3x3 sub-grid by changing their color. `Highlight` only reconfigures the cells whose color
+    changes from the previous selection. It also updates the `selected_cell` variable
     to track the current cell being edited.
 
     Args:
@@ -305,21 +608,8 @@ def on_cell_click(event, row: int, col: int):
     """
     global selected_cell
     selected_cell = (row,col)
-    selected_num = Data_Player[row][col]
-    cell_reset()
-    for r in range(9):
-        for c in range(9):
-            if Data_Player[r][c] == selected_num and Data_Player[r][c] is not None:
-                entries[r][c].config(state='normal', bg='lightblue', fg='magenta')
-    for i in range(9):
-        entries[i][col].config(state='normal', bg='lightblue', fg='black')
-        entries[row][i].config(state='normal', bg='lightblue', fg='black')
-    sub_row = 3 * (row // 3)
-    sub_col = 3 * (col // 3)
-    for r in range(sub_row, sub_row + 3):
-        for c in range(sub_col, sub_col + 3):
-            entries[r][c].config(state='normal', bg='lightblue', fg='black')
-    entries[row][col].config(fg='magenta')
+    Highlight.begin()
+    Highlight.select(selected_cell)
     entries[row][col].focus_set()
 
 def on_click_outside(event):
@@ -334,13 +624,15 @@ def on_click_outside(event):
     """
     if not(Frame_grid.winfo_rootx() <= event.x_root <= Frame_grid.winfo_rootx() + Frame_grid.winfo_width() and
            Frame_grid.winfo_rooty() <= event.y_root <= Frame_grid.winfo_rooty() + Frame_grid.winfo_height()):
+        Highlight.begin()
         cell_reset()
 
+@time_Call()
 def button_Check():
     """
     Checks the player's current entries against the correct solution.
 
-    This function compares the player's entries in `Data_Player` with the `Data_All`. Then updates
+    This function reads the wrong entries and the progress kept up to date by `Game_state`. Then updates
     the mistake count for incorrect entries and displays the player's progress as a percentage. 
     If the solution is correct, it ends the game with a win message. If the player makes three 
     mistakes, it ends the game with a "Game Over" message.
@@ -349,41 +641,42 @@ def button_Check():
         - mistake: The current count of mistakes made by the player.
         - Frame_grid: The frame containing the Sudoku grid.
         - Frame_main: The main frame of the game window.
-        - Data_Player: The grid containing the player's current entries.
-        - Data_All: The correct solution grid.
+        - Game_state: The `GameState` of the player's current entries.
         - Label_mistake: A label displaying the number of mistakes.
         - Label_progress: A label displaying the player's progress in percentage.
         - Button_hint: The button for using hints (disabled on game end).
         - Button_check: The button for checking the player's solution (disabled on game over).
+        - Button_save: The button for saving the game (disabled on game end).
     """
-
+    Highlight.begin()
     global mistake, color_progress, Frame_grid, Frame_main
-    progress = 0
     w = Frame_grid.winfo_width()
     h = Frame_grid.winfo_height()
-    for (row, col) in location:
-        if Data_Player[row][col] is not None:
-            if Data_Player[row][col] != Data_All[row][col]:
-                mistake += 1
-                entries[row][col].config(bg="lightpink", fg="red")
-        if Data_Player[row][col] == Data_All[row][col]:
-            progress += 1
-    progress = round(100*progress/len(location))
+    for (row, col) in Game_state.wrong:
+        mistake += 1
+        Highlight.mark(row, col, "lightpink", "red")
+    progress = Game_state.progress()
     color_p = color_progress if progress <= 50 else ("orange" if progress <= 90 else "green")
     Label_mistake.config(text = f"mistake:{mistake}/3")
     Label_progress.config(text = f"progress:{progress}%", fg=color_p)
-    if all(Data_Player[row][col] == Data_All[row][col] for (row,col) in location):
+    if Game_state.is_complete():
+        Highlight.active = False
+        forget_Game()
         Frame_grid.destroy()
         Button_hint.config(state="disabled")
+        Button_save.config(state="disabled")
         Frame_grid = Frame(Frame_main, bg="white", width=w, height=h)
         Frame_grid.pack(side=LEFT, padx=20)
         Frame_grid.pack_propagate(False)
         game_over = Label(Frame_grid, text="YOU WIN 🎉🎉🎉", font=("Impact",36,"bold"),bg="green")
         game_over.pack(expand=True)
     elif mistake >= 3:
+        Highlight.active = False
+        forget_Game()
         Frame_grid.destroy()
         Button_hint.config(state="disabled")
         Button_check.config(state="disabled")
+        Button_save.config(state="disabled")
         Label_mistake.config(text="mistake:3/3", fg="grey")
         Frame_grid = Frame(Frame_main, bg="white", width=w, height=h)
         Frame_grid.pack(side=LEFT, padx=20)
@@ -391,6 +684,7 @@ def button_Check():
         game_over = Label(Frame_grid, text="GAME OVER", font=("Impact",36,"bold"),bg="red")
         game_over.pack(expand=True)
         
+@time_Call()
 def button_Restart():
     """
     Restarts the Sudoku game by resetting the player's grid.
@@ -401,59 +695,116 @@ def button_Restart():
     Global Variables:
         - Data_Player: The grid containing the player's current entries.
         - Data_Game: The initial Sudoku puzzle grid with some cells empty.
-        - location: The list of coordinates representing the empty cells.
+        - location: The set of coordinates of the empty cells.
+        - Game_state: The `GameState` of the player's current entries.
     """
-    global hint, hint_or, level_text, Data_Player, Data_Game, location
+    global hint, hint_or, level_text, Data_Player, Data_Game, location, Game_state
     hint = hint_or
-    Data_Player = [row[:] for row in Data_Game]
-    location = [(r,c) for r in range(9) for c in range(9) if Data_Game[r][c] is None]
+    size = len(Data_Game)
+    location = {(r,c) for r in range(size) for c in range(size) if Data_Game[r][c] is None}
+    Game_state = GameState(Data_All, Data_Game, location)
+    Data_Player = Game_state.player
     GUI(Data_Game)
     Label_level.config(text=level_text)
     
+@time_Call()
 def button_Hint():
     """
-    Provides a hint to the player by revealing a number in an empty cell.
+    Provides a hint to the player: the next logical step of the board, or a revealed number.
 
-    This function either fills the currently selected empty cell or a random empty cell with 
-    the correct value from `Data_All`. It decreases the hint count, and disables the hint
-    button when no hints are remaining.
+    `GameState.hint` looks for a mistake to fix or the easiest deduction on the player's 
+    current entries. A deduction that places a digit reveals that cell; one that flags a 
+    mistake or eliminates candidates reveals nothing. Either way `show_Deduction` highlights its
+    cells and explains it. When no technique applies (or on boards above 9x9), the currently 
+    selected empty cell or a random empty cell is filled with the correct value from `Data_All`,
+    as before. Hints that reveal a cell or flag a mistake decrease the hint count (eliminations
+    are free), and the hint button is disabled when no hints are remaining.
 
     Global Variables:
         - hint: The number of hints remaining.
         - selected_cell: The currently selected cell in the Sudoku grid.
-        - location: The list of coordinates representing the empty cells.
+        - location: The set of coordinates of the empty cells.
         - Data_All: The correct solution grid.
         - Data_Player: The grid containing the player's current entries.
         - Button_hint: The button for using a hint (disabled when no hints remain).
     """
 
     global hint
-    if selected_cell and selected_cell in location:
-        r,c = selected_cell
-    else:
-        r,c = random.choice(location)
-    location.remove((r,c))
+    Highlight.begin()
+    deduction, cell = Game_state.hint(selected_cell)
+    if cell is None:
+        if deduction is not None and deduction["technique"] == "mistake":
+            use_Hint()
+        show_Deduction(deduction)
+        return
+    r, c = cell
+    location.discard((r,c))
     value = Data_All[r][c]
-    Data_Player[r][c] = value
+    old_value = Data_Player[r][c]
+    touched = Game_state.reveal(r, c)
     
-    entries[r][c].destroy()  # Remove the existing Entry widget
-    color = "lightgrey" if (r//3 + c//3)%2 == 0 else "white"
-    cell = Label(Frame_grid, width=2, text=str(value), font=('Chewy', 15), justify='center', relief="flat", bg=color, fg="blue")
-    cell.grid(row=r, column=c, padx=1, pady=1)
-    cell.bind("<Button-1>", lambda e, r=r, c=c: on_cell_click(e, r, c))
-    entries[r][c] = cell 
-
+    box = Game_state.box
+    color = "lightgrey" if (r//box + c//box)%2 == 0 else "white"
+    if Renderer == "canvas":
+        cell = entries[r][c]
+        cell.editable = False
+        cell.config(text=str(value), bg=color, fg="blue")
+    else:
+        entries[r][c].destroy()  # Remove the existing Entry widget
+        cell = Label(Frame_grid, width=2, text=str(value), font=CanvasBoard.FONTS[box], justify='center', relief="flat", bg=color, fg="blue")
+        cell.grid(row=r, column=c, padx=1, pady=1)
+        cell.bind("<Button-1>", lambda e, r=r, c=c: on_cell_click(e, r, c))
+        entries[r][c] = cell 
+    or_bg[r][c], or_fg[r][c], or_st[r][c] = cell.cget("background"), cell.cget("foreground"), cell.cget("state")
+    Highlight.replace(r, c, (or_bg[r][c], or_fg[r][c], or_st[r][c]))
+    show_Conflicts(touched)
+    button_Disable(value)
+    if old_value and old_value != value:
+        button_Disable(old_value)
+    use_Hint()
+    show_Deduction(deduction)
+
+def use_Hint():
+    """Takes one hint from the `hint` count and disables `Button_hint` when none are left."""
+    global hint
     hint -= 1
     Button_hint.config(text = f"hint:{hint}")
     if hint == 0:
         Button_hint.config(state="disabled")
+
+def show_Deduction(deduction: dict):
+    """
+    Highlights a deduction of `GameState.deduce` on the board and explains it under the grid.
+
+    Wrong cells are marked red. Otherwise the cells of the deduction's unit and pattern are marked
+    green and the cells losing candidates yellow. The marks last until the selection changes or
+    the next hint.
+    """
+    Highlight.select(Highlight.selected)  # drops the marks of the previous hint
+    if deduction is None:
+        Label_hint.config(text="")
+        return
+    if deduction["technique"] == "mistake":
+        for (r, c) in deduction["cells"]:
+            Highlight.mark(r, c, "pink", "red")
+    else:
+        if deduction["unit"] is not None:
+            for i in UNIT_CELLS[deduction["unit"]]:
+                Highlight.mark(i // 9, i % 9, "honeydew", Highlight.style(i // 9, i % 9)[1])
+        for (r, c) in deduction["cells"]:
+            Highlight.mark(r, c, "palegreen", Highlight.style(r, c)[1])
+        for (r, c, n) in deduction["eliminate"]:
+            Highlight.mark(r, c, "khaki", Highlight.style(r, c)[1])
+    Label_hint.config(text=f"{deduction['technique'].capitalize()}: {deduction['text']}")
     
+@time_Call()
 def button_Number(num: int):
     """
     Handles the input of a number button and fills the selected cell in the grid.
 
     This function modifies the value of the currently selected cell based on user input 
-    from the number buttons. It also checks for mistakes and updates the display accordingly.
+    from the number buttons. Only cells the player has to fill can be changed. It also checks 
+    for mistakes and updates the display accordingly.
 
     Args:
         num (int): The number selected by the player.
@@ -464,35 +815,176 @@ def button_Number(num: int):
         - Button_nums: A list of buttons representing the numbers 1-9.
     """
     global mistake
-    if selected_cell:
+    Highlight.begin()
+    if selected_cell and selected_cell in Game_state.blanks:
         row, col = selected_cell
-        if (row, col) in location:
-            entries[row][col].delete(0,END)
-            entries[row][col].insert(END, str(num))
-        Data_Player[row][col] = num
+        entries[row][col].delete(0,END)
+        entries[row][col].insert(END, str(num))
+        old_value = Data_Player[row][col]
+        show_Conflicts(Game_state.play(row, col, num))
         if num != Data_All[row][col]:
             mistake += 1
-            entries[row][col].config(bg="lightpink", fg="red")
+            Highlight.mark(row, col, "lightpink", "red")
         Label_mistake.config(text = f"mistake:{mistake}/3")
         button_Disable(num)
+        if old_value and old_value != num:
+            button_Disable(old_value)
+
+@time_Call()
+def button_Undo():
+    """
+    Takes back the player's last move (hints cannot be taken back).
+
+    Global Variables:
+        - Game_state: The `GameState` keeping the move history.
+    """
+    Highlight.begin()
+    if Highlight.active:
+        move = Game_state.undo()
+        if move:
+            show_Move(*move)
+
+@time_Call()
+def button_Redo():
+    """
+    Plays the last move taken back by `button_Undo` again.
+
+    Global Variables:
+        - Game_state: The `GameState` keeping the move history.
+    """
+    Highlight.begin()
+    if Highlight.active:
+        move = Game_state.redo()
+        if move:
+            show_Move(*move)
+
+def show_Move(row: int, col: int, n: int, touched: set):
+    """
+    Shows the digit of a cell changed by `button_Undo` or `button_Redo`.
+
+    Args:
+        row (int): The row index of the cell.
+        col (int): The column index of the cell.
+        n (int): The digit now in the cell (None if empty).
+        touched (set): The cells whose conflict status may have changed.
+    """
+    entries[row][col].delete(0, END)
+    if n is not None:
+        entries[row][col].insert(END, str(n))
+    show_Conflicts(touched)
+    for num in range(1, Game_state.size + 1):
+        button_Disable(num)
+
+@time_Call()
+def save_Game():
+    """
+    Saves the game in progress as the "last" session of `SESSION_FILE`; a game that has ended is not saved.
+
+    An unreadable `SESSION_FILE` is replaced by one holding only this game; a game too long for a 
+    snapshot is reported and not saved.
+
+    Global Variables:
+        - Game_state: The `GameState` of the player's current entries.
+        - level_text: The difficulty level of the game.
+        - hint: The number of hints remaining.
+        - mistake: The current count of mistakes made by the player.
+    """
+    if not Highlight.active:
+        return
+    try:
+        sessions = read_Sessions(SESSION_FILE)
+    except ValueError:
+        sessions = {}
+    try:
+        sessions["last"] = save_Session(Game_state, level_text, hint, mistake)
+        write_Sessions(SESSION_FILE, sessions)
+    except ValueError as error:
+        messagebox.showerror("SUDOKU", f"The game cannot be saved: {error}.")
+
+def forget_Game():
+    """
+    Removes the "last" session of `SESSION_FILE` once its game has ended or a new game starts, so
+    Resume does not bring back a finished game; other sessions are kept.
+    """
+    try:
+        sessions = read_Sessions(SESSION_FILE)
+    except ValueError:
+        sessions = {"last": b""}  # unreadable: rewrite it empty
+    if "last" in sessions:
+        del sessions["last"]
+        write_Sessions(SESSION_FILE, sessions)
+
+@time_Call()
+def resume_Game(name: str = "last"):
+    """
+    Restores a game saved by `save_Game` and displays it, entries, counters and history included.
+
+    Args:
+        name (str): The name of the session in `SESSION_FILE`.
+
+    Global Variables:
+        - location: The set of coordinates of the cells the player still has to fill.
+        - hint: The number of hints remaining.
+        - mistake: The current count of mistakes made by the player.
+        - Data_All: The fully solved Sudoku grid.
+        - Data_Game: The initial Sudoku puzzle grid with some cells empty.
+        - Data_Player: The grid containing the player's current progress.
+        - Game_state: The restored `GameState`.
+    """
+    global location, hint, hint_or, level_text, mistake, Data_All, Data_Game, Data_Player, Game_state
+    global Pending_level
+    try:
+        sessions = read_Sessions(SESSION_FILE)
+        if name not in sessions:
+            Label_level.config(text="No saved game")
+            return
+        session = load_Session(sessions[name])
+    except ValueError as error:
+        messagebox.showerror("SUDOKU", f"The saved game cannot be resumed: {error}.")
+        return
+    Pending_level = None  # a puzzle still being generated must not replace the resumed game
+    Game_state = session["state"]
+    Data_All, Data_Game, Data_Player = Game_state.solution, session["puzzle"], Game_state.player
+    location = set(Game_state.blanks)
+    level_text, hint, hint_or = session["level"], session["hint"], LEVELS[session["level"]]["hint"]
+    size = Game_state.size
+    GUI([[None if (r, c) in Game_state.blanks else Data_Player[r][c] for c in range(size)] for r in range(size)])
+    for (r, c) in location:
+        if Data_Player[r][c] is not None:
+            entries[r][c].insert(END, str(Data_Player[r][c]))
+    show_Conflicts(Game_state.conflicts)
+    mistake = session["mistake"]
+    Label_mistake.config(text=f"mistake:{mistake}/3")
+    Label_progress.config(text=f"progress:{Game_state.progress()}%")
+    Button_hint.config(text=f"hint:{hint}", state="normal" if hint else "disabled")
+    for num in range(1, size + 1):
+        button_Disable(num)
+    Label_level.config(text=level_text)
+
+def on_Close():
+    """
+    Saves the game in progress with `save_Game` before closing the window, so it can be resumed.
+    """
+    if Game_state is not None and Highlight.active:
+        save_Game()
+    root.destroy()
 
 def button_Disable(num: int):
     """
     Disables the number button when all instances of the number have been placed.
 
-    This function checks how many times the number `num` has been placed in the player's grid 
-    (`Data_Player`). If the count reaches 9, the corresponding number button is disabled.
+    This function reads how many times the number `num` has been placed in the player's grid 
+    from `Game_state`. If the count reaches 9, the corresponding number button is disabled.
 
     Args:
         num (int): The number to check and disable if fully placed.
 
     Global Variables:
         - Button_nums: A list of buttons representing the numbers 1-9.
-        - Data_Player: The grid containing the player's current entries.
+        - Game_state: The `GameState` of the player's current entries.
     """
     global Button_nums
-    count = sum(row.count(num) for row in Data_Player)
-    if count >= 9:
+    if Game_state.is_used_up(num):
         Button_nums[num-1].config(state="disabled")
     else:
         Button_nums[num-1].config(state="normal")
@@ -502,20 +994,26 @@ def cell_reset():
     Resets the visual state of the Sudoku grid.
 
     This function resets the background color, text color, and state (enabled/disabled) of 
-    all cells in the Sudoku grid to their original values (`or_bg`, `or_fg`, `or_st`).
+    the cells in the Sudoku grid to their original values (`or_bg`, `or_fg`, `or_st`). Only the 
+    cells `Highlight` has changed are reconfigured; conflicts stay red.
 
     Global Variables:
-        - entries: A 2D list of widgets representing the cells in the grid.
-        - or_bg: A 2D list storing the original background color of each cell.
-        - or_fg: A 2D list storing the original foreground color of each cell.
-        - or_st: A 2D list storing the original state (normal/disabled) of each cell.
+        - Highlight: The `Highlighter` sending the highlight changes to the cells.
+    """
+    Highlight.select(None)
+
+def show_Conflicts(cells):
     """
+    Shows the live conflicts of the given cells.
 
-    for row in range(9):
-        for col in range(9):
-            if entries[row][col].winfo_exists():
-                entries[row][col].config(bg = or_bg[row][col], fg = or_fg[row][col], state = or_st[row][col])
+    Cells listed in `Game_state.conflicts` get a red text, the others get back the color of the
+    current highlight. Only the given cells whose color changes are reconfigured.
+
+    Args:
+        cells: The (row, col) cells to refresh, such as the set returned by `GameState.set`.
+    """
+    Highlight.update(cells)
 
     
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    command_Line(play=main)
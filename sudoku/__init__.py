@@ -0,0 +1,37 @@
+from .board import (GEOMETRIES, geometry, grid_Box, DIGITS, FULL_MASK, UNITS, UNIT_CELLS, PEER_CELLS,
+                    LEVELS, Board, validation)
+from .formats import (LINE_TO_CELLS, CELLS_TO_LINE, format_Grid, pack_Grid, unpack_Grid, parse_Line,
+                      format_Line, pack_Nibbles, unpack_Nibbles, read_Puzzles, read_Lines, write_Puzzles)
+from .instrument import (COUNTERS, TIMERS, LatencyStats, count_Event, record_Search, time_Phase, PhaseTimer,
+                         time_Call, start_Profile, stop_Profile, report_Profile, print_Profile)
+from .solver import (solve, count_Solutions, load_Board, propagate_Board, search_Board, count_Board,
+                     select_Cell, DancingLinks, search_DLX, count_DLX, SOLVERS, get_Solver, use_Solver)
+from .grader import (INTERSECTIONS, TECHNIQUES, STEPS, grade_Puzzle, place_Candidate, step_Hidden_Single,
+                     step_Naked_Single, step_Locked_Candidates, step_Naked_Pair, step_Hidden_Pair, step_X_Wing,
+                     find_Deduction, describe_Deduction)
+from .symmetry import (LINE_ORDERS, line_Orders, random_Transform, transform_Grid, transform_Puzzle, canonical_Key,
+                       first_Orders)
+from .generator import generate_Sudoku, fill_Board, remove_Clues, has_Single, make_Puzzle, load_Puzzle, PuzzlePool
+from .batch import (generate_Chunk, generate_Batch, verify_Chunk, verify_Batch,
+                    validate_Boards, compare_Boards, first_Cells, import_Numpy)
+from .game import GameState, SESSION_HEADER, save_Session, load_Session, write_Sessions, read_Sessions
+
+# the names `from sudoku import *` exports; the tables and step functions above stay importable by name
+__all__ = ["LEVELS", "geometry", "grid_Box", "Board", "validation",
+           "format_Grid", "pack_Grid", "unpack_Grid", "parse_Line", "format_Line", "pack_Nibbles", "unpack_Nibbles",
+           "read_Puzzles", "read_Lines", "write_Puzzles",
+           "LatencyStats", "time_Phase", "time_Call", "start_Profile", "stop_Profile", "report_Profile", "print_Profile",
+           "SOLVERS", "solve", "count_Solutions", "DancingLinks", "search_DLX", "get_Solver", "use_Solver",
+           "TECHNIQUES", "grade_Puzzle", "find_Deduction", "describe_Deduction",
+           "transform_Puzzle", "canonical_Key",
+           "generate_Sudoku", "fill_Board", "remove_Clues", "has_Single", "make_Puzzle", "load_Puzzle", "PuzzlePool",
+           "generate_Batch", "verify_Batch", "validate_Boards", "compare_Boards",
+           "GameState", "save_Session", "load_Session", "write_Sessions", "read_Sessions",
+           "command_Line"]
+
+def __getattr__(name: str):
+    """Imports `command_Line` on first use, so that importing the package does not load argparse."""
+    if name == "command_Line":
+        from .cli import command_Line
+        return command_Line
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,3 @@
+from .cli import command_Line
+
+command_Line()
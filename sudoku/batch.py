@@ -0,0 +1,226 @@
+from collections import deque
+import itertools
+import math
+import os
+import time
+from .board import geometry
+from .formats import format_Grid, parse_Line, format_Line, read_Lines
+from .generator import make_Puzzle
+from .instrument import LatencyStats
+from .solver import load_Board, get_Solver, use_Solver
+
+def generate_Chunk(task: tuple) -> list:
+    """
+    Builds a chunk of puzzles for the batch generator.
+
+    Puzzle k of the run is built by `make_Puzzle` with the seed "<run seed>-<k>", so every 
+    puzzle is reproducible no matter which worker process or chunk builds it.
+
+    Args:
+        task (tuple): The (level, seed, start, size) of the chunk, `start` being the index of its first puzzle.
+
+    Returns:
+        list: One "puzzle,solution" line per puzzle, as written by `generate_Batch`.
+    """
+    level, seed, start, size = task
+    lines = []
+    for index in range(start, start + size):
+        data, puzzle, location = make_Puzzle(level, seed=f"{seed}-{index}")
+        lines.append(f"{format_Grid(puzzle)},{format_Grid(data)}\n")
+    return lines
+
+def generate_Batch(level: str, count: int, output, workers: int = None, seed: int = 0, chunk: int = 100) -> int:
+    """
+    Generates puzzles headlessly across a process pool and streams them to a file.
+
+    The work is split into chunks of at most `chunk` puzzles, smaller when needed to give every 
+    worker a chunk, and results are written in chunk order as soon as they arrive. Every puzzle has a seed of its own derived from `seed` and its index, 
+    so the same `seed` and `count` give the same file for any number of workers or chunk size.
+
+    Args:
+        level (str): The difficulty level ("Easy", "Medium", "Hard", or "Expert").
+        count (int): The number of puzzles to generate.
+        output: A writable text file receiving one "puzzle,solution" line per puzzle.
+        workers (int): The number of worker processes (defaults to the number of CPUs).
+        seed (int): The run seed.
+        chunk (int): The largest number of puzzles per task.
+
+    Returns:
+        int: The number of puzzles written.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, min(chunk, math.ceil(count / workers)))
+    tasks = [(level, seed, start, min(chunk, count - start)) for start in range(0, count, chunk)]
+    written = 0
+    import multiprocessing  # imported here: it alone would double the import time of the package
+    with multiprocessing.Pool(workers, use_Solver, (get_Solver()["name"],)) as pool:
+        for lines in pool.imap(generate_Chunk, tasks):
+            output.writelines(lines)
+            written += len(lines)
+    return written
+
+def verify_Chunk(lines: list) -> list:
+    """
+    Solves and counts the solutions of a chunk of puzzle lines for the bulk verifier.
+
+    Args:
+        lines (list): The raw puzzle lines (bytes).
+
+    Returns:
+        list: One (puzzle, solution, count, nodes, seconds) tuple per line. `solution` is the 
+              first solution line or None, and `count` is 0 (no solution), 1 (unique), 
+              2 (several solutions) or -1 (the line is not a puzzle).
+    """
+    results = []
+    for line in lines:
+        start = time.perf_counter()
+        try:
+            raw = parse_Line(line)
+        except ValueError:
+            results.append((line.decode("ascii", "replace").strip(), None, -1, 0, 0.0))
+            continue
+        stats = {"nodes": 0}
+        found = []
+        board = load_Board(raw)
+        count = get_Solver()["count"](board, 2, stats, found) if board is not None else 0
+        solution = format_Line(found[0].to_bytes()) if found else None
+        results.append((format_Line(raw), solution, count, stats["nodes"], time.perf_counter() - start))
+    return results
+
+def verify_Batch(path: str, output, workers: int = None, chunk: int = 1000, use_mmap: bool = False) -> dict:
+    """
+    Streams a puzzle file through the solver in parallel chunks and writes per-puzzle results.
+
+    At most two chunks per worker are in flight at any time, so memory stays bounded for files 
+    of any size. Results are written in input order, one "puzzle,solution,count,nodes,microseconds"
+    line per puzzle, with "-" as the solution of puzzles that have none.
+
+    Args:
+        path (str): The puzzle file, one puzzle per line.
+        output: A writable text file receiving the results.
+        workers (int): The number of worker processes (defaults to the number of CPUs).
+        chunk (int): The number of puzzles per task.
+        use_mmap (bool): Whether to read the file through `mmap`.
+
+    Returns:
+        dict: The number of `unique`, `multiple`, `unsolvable` and `invalid` puzzles and the
+              `latency` (a `LatencyStats`) of solved lines.
+    """
+    summary = {"unique": 0, "multiple": 0, "unsolvable": 0, "invalid": 0, "latency": LatencyStats()}
+    names = {-1: "invalid", 0: "unsolvable", 1: "unique", 2: "multiple"}
+    lines = read_Lines(path, use_mmap)
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+
+    def write(results):
+        for (puzzle, solution, count, nodes, seconds) in results:
+            summary[names[count]] += 1
+            if count >= 0:
+                summary["latency"].add(seconds)
+            output.write(f"{puzzle},{solution or '-'},{count},{nodes},{round(seconds * 1e6)}\n")
+
+    import multiprocessing  # imported here: it alone would double the import time of the package
+    with multiprocessing.Pool(workers, use_Solver, (get_Solver()["name"],)) as pool:
+        while True:
+            batch = list(itertools.islice(lines, chunk))
+            if not batch:
+                break
+            pending.append(pool.apply_async(verify_Chunk, (batch,)))
+            if len(pending) >= 2 * workers:
+                write(pending.popleft().get())
+        while pending:
+            write(pending.popleft().get())
+    return summary
+
+def validate_Boards(boards, allow_empty: bool = False, chunk: int = 2048) -> tuple:
+    """
+    Validates a whole batch of boards at once with vectorized NumPy operations.
+
+    For every unit kind (rows, columns, boxes) each placed digit gets a (board, unit, digit) key,
+    and a single `numpy.bincount` over the chunk counts all keys; a cell is in conflict if its 
+    key was counted more than once, or if it is empty or out of range. Boards from `read_Puzzles`
+    can be stacked with `numpy.frombuffer(b"".join(boards), numpy.uint8).reshape(-1, 9, 9)`.
+
+    Args:
+        boards: An (N, 9, 9) array-like of digits (or (N, 16, 16), (N, 25, 25)), 0 for empty cells.
+        allow_empty (bool): Whether empty cells are allowed, to check partially filled boards.
+        chunk (int): The number of boards counted at a time, bounding memory use.
+
+    Returns:
+        tuple: An (N,) bool array, True for valid boards, and an (N, 2) array with the (row, col) 
+               of the first conflicting cell of each board in row order, (-1, -1) for valid boards.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    numpy = import_Numpy("validate_Boards")
+    boards = numpy.asarray(boards, dtype=numpy.uint8)
+    count, size = boards.shape[0], boards.shape[1]
+    lines = numpy.arange(size)
+    units = (lines[:, None], lines[None, :], numpy.array(geometry(math.isqrt(size))["box_of"]))
+    bad = numpy.empty((count, size, size), dtype=bool)
+    for start in range(0, count, chunk):
+        part = boards[start:start + chunk]
+        n = len(part)
+        placed = (part >= 1) & (part <= size)
+        digit = numpy.where(placed, part, 1).astype(numpy.intp) - 1
+        first = numpy.arange(n)[:, None, None] * size
+        twice = numpy.zeros((n, size, size), dtype=bool)
+        for unit in units:
+            # empty and out-of-range cells all go to one extra key past the end
+            keys = numpy.where(placed, (first + unit) * size + digit, n * size * size)
+            twice |= numpy.bincount(keys.ravel(), minlength=n * size * size + 1)[keys] > 1
+        bad[start:start + n] = placed & twice
+        bad[start:start + n] |= (part > size) if allow_empty else ~placed
+    return ~bad.any(axis=(1, 2)), first_Cells(bad)
+
+def compare_Boards(boards, solutions) -> dict:
+    """
+    Compares a batch of player boards with their solutions, like `button_Check` does for one board.
+
+    Args:
+        boards: An (N, 9, 9) array-like of the player's digits, 0 for empty cells.
+        solutions: The (N, 9, 9) solutions, or one (9, 9) solution shared by every board.
+
+    Returns:
+        dict: (N,) arrays with the number of `correct`, `wrong` and `empty` cells of each board and
+              whether it is `complete` (equal to its solution), and the (N, 2) `first_wrong` cell 
+              of each board, (-1, -1) if no entry is wrong.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    numpy = import_Numpy("compare_Boards")
+    boards = numpy.asarray(boards, dtype=numpy.uint8)
+    solutions = numpy.asarray(solutions, dtype=numpy.uint8)
+    filled = boards != 0
+    wrong = filled & (boards != solutions)
+    return {"correct": (filled & ~wrong).sum(axis=(1, 2)), "wrong": wrong.sum(axis=(1, 2)),
+            "empty": (~filled).sum(axis=(1, 2)), "complete": (boards == solutions).all(axis=(1, 2)),
+            "first_wrong": first_Cells(wrong)}
+
+def first_Cells(mask):
+    """Returns an (N, 2) array of the (row, col) of the first True cell of every (size, size) board of `mask`, (-1, -1) for none."""
+    numpy = import_Numpy("first_Cells")
+    count, size = mask.shape[0], mask.shape[1]
+    flat = mask.reshape(count, size * size)
+    position = flat.argmax(axis=1)
+    cells = numpy.stack([position // size, position % size], axis=1)
+    cells[~flat.any(axis=1)] = -1
+    return cells
+
+def import_Numpy(name: str):
+    """
+    Imports NumPy on first use, so that importing the package stays fast without it.
+
+    Args:
+        name (str): The function needing NumPy, for the error message.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(f"{name} needs NumPy (pip install numpy)") from None
+    return numpy
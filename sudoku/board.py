@@ -0,0 +1,164 @@
+GEOMETRIES = {}
+CROSS_PEERS = {}  # board size -> the `cross_peers` table of `geometry`, for `validation`
+
+def geometry(box: int) -> dict:
+    """
+    Returns the shape tables of a board made of `box` x `box` boxes (3 for 9x9, 4 for 16x16, 5 for 25x25).
+
+    The tables are built once per box size and shared by every board of that size.
+
+    Args:
+        box (int): The side of a box in cells.
+
+    Returns:
+        dict: The `box` and board `size`, the `full` candidate mask (bits 1..size), the `units`
+              (rows, columns then boxes as lists of (row, col)), `box_of`, the box number of 
+              each cell, `unit_of`, the (row, column, box) unit numbers of each cell, `peers`,
+              the tuple of (row, col) cells sharing a unit with each cell (20 for 9x9), and 
+              `cross_peers`, the peers of each cell outside its row (12 for 9x9).
+    """
+    if box not in GEOMETRIES:
+        size = box * box
+        units = ([[(r, c) for c in range(size)] for r in range(size)] +
+                 [[(r, c) for r in range(size)] for c in range(size)] +
+                 [[(r, c) for r in range(br, br + box) for c in range(bc, bc + box)]
+                  for br in range(0, size, box) for bc in range(0, size, box)])
+        box_of = [[(r//box)*box + c//box for c in range(size)] for r in range(size)]
+        unit_of = [[(r, size + c, 2*size + box_of[r][c]) for c in range(size)] for r in range(size)]
+        peers = [[tuple(sorted({cell for unit in unit_of[r][c] for cell in units[unit]} - {(r, c)}))
+                  for c in range(size)] for r in range(size)]
+        cross_peers = [[tuple(cell for cell in peers[r][c] if cell[0] != r) for c in range(size)] for r in range(size)]
+        GEOMETRIES[box] = {"box": box, "size": size, "full": ((1 << size) - 1) << 1, "units": units,
+                           "box_of": box_of, "unit_of": unit_of, "peers": peers, "cross_peers": cross_peers}
+        CROSS_PEERS[size] = cross_peers
+    return GEOMETRIES[box]
+
+def grid_Box(data) -> int:
+    """Returns the box side of a square grid (a list of rows or a flat byte board): 3 for 9x9, 4 for 16x16."""
+    cells = len(data) if isinstance(data, (bytes, bytearray)) else len(data) ** 2
+    return round(cells ** 0.25)
+
+DIGITS = range(1, 10)
+FULL_MASK = 0b1111111110  # bits 1..9 set, one per digit
+UNITS = geometry(3)["units"]
+UNIT_CELLS = [[r*9 + c for (r, c) in unit] for unit in UNITS]
+PEER_CELLS = [sorted({p for unit in UNIT_CELLS if i in unit for p in unit} - {i}) for i in range(81)]
+LEVELS = {"Easy": {"location": 21, "hint": 2}, "Medium": {"location": 31, "hint": 3}, 
+          "Hard": {"location": 41, "hint": 4}, "Expert": {"location": 51, "hint": 5}}
+
+class Board:
+    """
+    Bitmask-backed Sudoku board used by the generator and the validators.
+
+    Besides the `cells` grid, the board keeps the digits used in every row, column and 
+    box as integer bitmasks (bit `n` set means digit `n` is present). The masks are 
+    updated by `set` and `clear`, so the candidates of a cell are a single AND instead of 
+    scanning the row, column and box lists. Boards are 9x9 by default; `box` selects larger
+    sizes (4 for 16x16, 5 for 25x25) and is inferred from `data` when given.
+
+    A board can also be built from, and exported to, the compact byte format of `parse_Line`.
+
+    Attributes:
+        box (int): The side of a box in cells.
+        size (int): The side of the board (box * box), which is also the largest digit.
+        cells (list): A size x size list of digits (None for empty cells).
+        rows (list): The occupancy bitmask of each row.
+        cols (list): The occupancy bitmask of each column.
+        boxes (list): The occupancy bitmask of each box, numbered row-major.
+    """
+    __slots__ = ("box", "size", "full", "units", "box_of", "cells", "rows", "cols", "boxes")
+
+    def __init__(self, data: list = None, box: int = None):
+        if box is None:
+            box = grid_Box(data) if data is not None else 3
+        shape = geometry(box)
+        self.box, self.size, self.full = box, shape["size"], shape["full"]
+        self.units, self.box_of = shape["units"], shape["box_of"]
+        size = self.size
+        self.cells = [[None]*size for _ in range(size)]
+        self.rows = [0]*size
+        self.cols = [0]*size
+        self.boxes = [0]*size
+        if isinstance(data, (bytes, bytearray)):
+            for index, n in enumerate(data):
+                if n:
+                    self.set(index // size, index % size, n)
+        elif data is not None:
+            for row in range(size):
+                for col in range(size):
+                    if data[row][col] is not None:
+                        self.set(row, col, data[row][col])
+
+    def set(self, row: int, col: int, n: int):
+        """Places the digit `n` at (row, col) and marks it in the row, column and box masks."""
+        bit = 1 << n
+        self.cells[row][col] = n
+        self.rows[row] |= bit
+        self.cols[col] |= bit
+        self.boxes[self.box_of[row][col]] |= bit
+
+    def clear(self, row: int, col: int):
+        """Empties the cell at (row, col) and removes its digit from the masks."""
+        n = self.cells[row][col]
+        if n is None:
+            return
+        bit = ~(1 << n)
+        self.cells[row][col] = None
+        self.rows[row] &= bit
+        self.cols[col] &= bit
+        self.boxes[self.box_of[row][col]] &= bit
+
+    def candidates(self, row: int, col: int) -> int:
+        """Returns the bitmask of digits not yet used in the row, column or box of (row, col)."""
+        return self.full & ~(self.rows[row] | self.cols[col] | self.boxes[self.box_of[row][col]])
+
+    def can_place(self, n: int, row: int, col: int) -> bool:
+        """Returns True if the digit `n` is not used in the row, column or box of (row, col)."""
+        return bool(self.candidates(row, col) >> n & 1)
+
+    def copy(self) -> "Board":
+        """Returns an independent copy of the board and its masks."""
+        board = Board.__new__(Board)
+        board.box, board.size, board.full = self.box, self.size, self.full
+        board.units, board.box_of = self.units, self.box_of
+        board.cells = [row[:] for row in self.cells]
+        board.rows = self.rows[:]
+        board.cols = self.cols[:]
+        board.boxes = self.boxes[:]
+        return board
+
+    def to_list(self) -> list:
+        """Returns a copy of the board as a list of rows."""
+        return [row[:] for row in self.cells]
+
+    def to_bytes(self) -> bytes:
+        """Returns the board in the compact byte format, one byte per cell (0 for empty cells)."""
+        return bytes(n or 0 for row in self.cells for n in row)
+
+def validation(data: list, n: int, row: int, col: int) -> bool:
+    """
+    Validates whether a number can be placed at a specific cell of the Sudoku grid.
+
+    This function checks if the number `n` can be placed at the given location (row, col)                                                                                                                                                       
+    in the `data` grid. It verifies that `n` does not already exist in the current row, 
+    column, or the 3x3 subgrid (or larger box for 16x16 and 25x25 grids), cell included. The 
+    row is a single `in` test, then the column and box cells off the row are read from the 
+    `cross_peers` table of `geometry`, found by board size; hot loops that place many digits 
+    should keep a `Board` around and call `Board.can_place` instead.
+
+    Args:
+        data (list): A 9x9 (or 16x16, 25x25) list representing the Sudoku board.
+        n (int): The number to placed in the grid.
+        row (int): The row index where the number is to be placed.
+        col (int): The column index where the number is to be placed.
+
+    Returns:
+        bool: True if the number can be placed, False otherwise.
+    """
+    if n in data[row]:
+        return False
+    table = CROSS_PEERS.get(len(data)) or geometry(grid_Box(data))["cross_peers"]
+    for (r, c) in table[row][col]:
+        if data[r][c] == n:
+            return False
+    return True
@@ -0,0 +1,100 @@
+import argparse
+import math
+import sys
+import time
+from .board import LEVELS
+from .batch import generate_Batch, verify_Batch
+from .instrument import start_Profile, stop_Profile, print_Profile
+from .solver import SOLVERS, use_Solver
+
+def command_Line(argv: list = None, play=None):
+    """
+    Parses the command line and runs the requested command.
+
+    Without a command the game is started with `play`, such as the Tkinter `main` of project.py.
+    The `generate` command runs `generate_Batch` and the `verify` command runs `verify_Batch`, 
+    both without a display and reporting the throughput on stderr. The `serve` command runs the
+    HTTP/JSON `PuzzleServer` until interrupted. With `--profile`, the timings of every phase and 
+    handler and the search counters recorded by `instrument` in this process are printed on stderr 
+    when the command ends (the worker processes of the batch commands and the server are not 
+    profiled); `--profile-output` also saves the `cProfile` statistics of the run.
+
+    Args:
+        argv (list): The command line arguments (defaults to `sys.argv[1:]`).
+        play: The function starting the game, called with the renderer and the box side; without
+              it the usage is printed instead.
+    """
+    parser = argparse.ArgumentParser(prog="project", description="SUDOKU game and puzzle tools.")
+    parser.add_argument("--canvas", action="store_true", help="draw the grid on a single canvas")
+    parser.add_argument("--solver", choices=list(SOLVERS), default="propagate", help="solver backend")
+    parser.add_argument("--size", type=int, choices=[9, 16, 25], default=9, help="side of the board played")
+    parser.add_argument("--profile", action="store_true", help="print phase timings and search counters on exit")
+    parser.add_argument("--profile-output", metavar="FILE", help="save cProfile statistics of the run to FILE")
+    commands = parser.add_subparsers(dest="command")
+    generate = commands.add_parser("generate", help="generate puzzles without opening a window")
+    generate.add_argument("--level", choices=list(LEVELS), default="Easy")
+    generate.add_argument("--count", type=int, default=100)
+    generate.add_argument("--workers", type=int, default=None)
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("--chunk", type=int, default=100, help="largest number of puzzles per task")
+    generate.add_argument("--output", default="-", help="output file ('-' for stdout)")
+    verify = commands.add_parser("verify", help="solve and count the solutions of every puzzle in a file")
+    verify.add_argument("input", help="puzzle file, one puzzle per line")
+    verify.add_argument("--workers", type=int, default=None)
+    verify.add_argument("--chunk", type=int, default=1000)
+    verify.add_argument("--mmap", action="store_true", help="read the input through mmap")
+    verify.add_argument("--output", default="-", help="result file ('-' for stdout)")
+    serve = commands.add_parser("serve", help="serve puzzles over HTTP/JSON")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    use_Solver(args.solver)
+
+    if args.profile or args.profile_output:
+        start_Profile(args.profile_output)
+    try:
+        run_Command(args, parser, play)
+    finally:
+        if args.profile or args.profile_output:
+            report = stop_Profile()
+            if args.profile:
+                print_Profile(report)
+
+def run_Command(args: argparse.Namespace, parser: argparse.ArgumentParser, play):
+    """Runs the command parsed by `command_Line`."""
+    if args.command == "generate":
+        output = sys.stdout if args.output == "-" else open(args.output, "w")
+        start = time.perf_counter()
+        try:
+            written = generate_Batch(args.level, args.count, output, args.workers, args.seed, args.chunk)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        elapsed = time.perf_counter() - start
+        print(f"{written} {args.level} puzzles in {elapsed:.2f}s ({written/elapsed:.1f} puzzles/s)", file=sys.stderr)
+    elif args.command == "verify":
+        output = sys.stdout if args.output == "-" else open(args.output, "w")
+        start = time.perf_counter()
+        try:
+            summary = verify_Batch(args.input, output, args.workers, args.chunk, args.mmap)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        elapsed = time.perf_counter() - start
+        latency = summary.pop("latency").summary()
+        total = latency["count"] + summary["invalid"]
+        print(", ".join(f"{name}:{count}" for name, count in summary.items()), file=sys.stderr)
+        print(f"{total} puzzles in {elapsed:.2f}s ({total/elapsed:.1f} puzzles/s), latency ms "
+              f"mean:{latency['mean']:.3f} p50:{latency['p50']:.3f} p90:{latency['p90']:.3f} p99:{latency['p99']:.3f}", file=sys.stderr)
+    elif args.command == "serve":
+        import asyncio  # imported here, like the server, to keep the package import fast
+        from .server import serve
+        try:
+            asyncio.run(serve(args.host, args.port, args.workers))
+        except KeyboardInterrupt:
+            pass
+    elif play is not None:
+        play("canvas" if args.canvas else "widgets", math.isqrt(args.size))
+    else:
+        parser.print_usage()
@@ -0,0 +1,122 @@
+import mmap
+from .board import grid_Box
+
+LINE_TO_CELLS = bytes.maketrans(b".0123456789", bytes([0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9]))
+CELLS_TO_LINE = bytes.maketrans(bytes(range(10)), b".123456789")
+
+def format_Grid(data: list) -> str:
+    """Returns a 9x9 grid as an 81-character line, row by row, with '.' for empty cells."""
+    return format_Line(pack_Grid(data))
+
+def pack_Grid(data: list) -> bytes:
+    """Returns a 9x9 grid as an 81-byte board, row by row, with 0 for empty cells."""
+    return bytes(n or 0 for row in data for n in row)
+
+def unpack_Grid(raw: bytes) -> list:
+    """Returns a byte board (81 bytes for 9x9) as a list of rows with None for empty cells."""
+    size = grid_Box(raw) ** 2
+    return [[n or None for n in raw[r*size:r*size+size]] for r in range(size)]
+
+def parse_Line(line) -> bytes:
+    """
+    Converts an 81-character puzzle line into an 81-byte board.
+
+    The line holds the cells row by row, with '.' or '0' for empty cells. Only the first field
+    of a comma separated line is read, so "puzzle,solution" lines give the puzzle. The conversion
+    is a single `bytes.translate`, without a Python object per cell.
+
+    Args:
+        line (str | bytes): The puzzle line.
+
+    Returns:
+        bytes: The board, one byte per cell with 0 for empty cells.
+
+    Raises:
+        ValueError: If the line does not hold 81 valid cells.
+    """
+    if isinstance(line, str):
+        line = line.encode("ascii")
+    raw = line.split(b",", 1)[0].strip().translate(LINE_TO_CELLS)
+    if len(raw) != 81 or max(raw) > 9:
+        raise ValueError(f"invalid puzzle line: {line[:90]!r}")
+    return raw
+
+def format_Line(raw: bytes) -> str:
+    """Returns an 81-byte board as an 81-character puzzle line with '.' for empty cells."""
+    return raw.translate(CELLS_TO_LINE).decode("ascii")
+
+def pack_Nibbles(raw: bytes) -> bytes:
+    """Packs an 81-byte board into 41 bytes, two 4-bit cells per byte."""
+    raw = bytes(raw) + b"\0"
+    return bytes(raw[i] << 4 | raw[i+1] for i in range(0, 82, 2))
+
+def unpack_Nibbles(packed: bytes) -> bytes:
+    """Unpacks a 41-byte board from `pack_Nibbles` back into the 81-byte format."""
+    raw = bytearray(82)
+    raw[0::2] = bytes(b >> 4 for b in packed)
+    raw[1::2] = bytes(b & 15 for b in packed)
+    return bytes(raw[:81])
+
+def read_Puzzles(path: str, use_mmap: bool = False):
+    """
+    Streams the puzzles of a file, one puzzle per line, as 81-byte boards.
+
+    Args:
+        path (str): The puzzle file.
+        use_mmap (bool): Whether to read the file through `mmap`.
+
+    Yields:
+        bytes: The board of each puzzle line, as returned by `parse_Line`.
+    """
+    for line in read_Lines(path, use_mmap):
+        yield parse_Line(line)
+
+def read_Lines(path: str, use_mmap: bool = False):
+    """
+    Streams the raw puzzle lines of a file.
+
+    Lines are read one at a time (through a read-only memory map when `use_mmap` is set), so 
+    files with millions of puzzles are read in constant memory. Blank lines and lines starting
+    with '#' are skipped.
+
+    Args:
+        path (str): The puzzle file.
+        use_mmap (bool): Whether to read the file through `mmap`.
+
+    Yields:
+        bytes: Each puzzle line, including its line ending.
+    """
+    with open(path, "rb") as file:
+        if use_mmap:
+            try:
+                source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                return
+            lines = iter(source.readline, b"")
+        else:
+            source = None
+            lines = file
+        try:
+            for line in lines:
+                if line.strip() and not line.startswith(b"#"):
+                    yield line
+        finally:
+            if source is not None:
+                source.close()
+
+def write_Puzzles(output, boards) -> int:
+    """
+    Writes 81-byte boards to a binary file, one 81-character puzzle line each.
+
+    Args:
+        output: A writable binary file.
+        boards: An iterable of 81-byte boards.
+
+    Returns:
+        int: The number of puzzles written.
+    """
+    count = 0
+    for raw in boards:
+        output.write(raw.translate(CELLS_TO_LINE) + b"\n")
+        count += 1
+    return count
@@ -0,0 +1,402 @@
+import os
+import random
+import struct
+from .board import geometry, grid_Box, LEVELS
+from .formats import pack_Nibbles, unpack_Nibbles
+from .grader import find_Deduction
+
+class GameState:
+    """
+    Incrementally maintained state of a game in progress.
+
+    Every change of a player cell goes through `set`, which updates the per-digit counts, the 
+    number of correct cells, the set of wrong cells and the live conflicts (cells sharing a 
+    digit with another cell of a row, column or box) in constant time. Progress, number button
+    state and win detection are then plain reads instead of rescans of the grid.
+
+    The player's moves go through `play` and hints through `reveal`, which also record them as 
+    small integer deltas (cell, old digit, new digit and a hint flag) for `undo` and `redo`.
+
+    `set` also keeps the candidate bitmask of every cell (the digits absent from its units) up to
+    date, touching only the cell's peers, so `deduce` can look for the next logical step of the 
+    player's board without rebuilding the candidates.
+
+    Attributes:
+        solution (list): The fully solved grid (9x9, 16x16 or 25x25).
+        player (list): The grid of the player's current entries.
+        blanks (set): The (row, col) cells the player has to fill.
+        hinted (set): The cells revealed by hints, no longer part of `blanks`.
+        counts (list): The number of cells holding each digit, indexed by digit.
+        correct (int): The number of cells of `blanks` holding the solution's digit.
+        wrong (set): The cells of `blanks` holding a digit other than the solution's.
+        conflicts (set): The cells whose digit also appears in one of their units.
+        history (list): The encoded moves that `undo` takes back, oldest first.
+        future (list): The encoded moves that `redo` plays again, next one last.
+        candidates (list): The candidate bitmask of every cell, row-major (0 for filled cells).
+        excluded (list): The candidates of every cell ruled out by earlier deductions of `deduce`.
+    """
+    def __init__(self, solution: list, puzzle: list, location: list):
+        self.solution = solution
+        self.size = len(solution)
+        self.box = grid_Box(solution)
+        shape = geometry(self.box)
+        self._unit_of, self._peers = shape["unit_of"], shape["peers"]
+        self.candidates = [shape["full"]] * (self.size * self.size)
+        self.excluded = [0] * (self.size * self.size)
+        self.player = [[None]*self.size for _ in range(self.size)]
+        self.blanks = set(location)
+        self.hinted = set()
+        self.history = []
+        self.future = []
+        self.counts = [0]*(self.size + 1)
+        self.correct = 0
+        self.wrong = set()
+        self.conflicts = set()
+        self._places = {}  # (unit, digit) -> cells of the unit holding the digit
+        for row in range(self.size):
+            for col in range(self.size):
+                if puzzle[row][col] is not None:
+                    self.set(row, col, puzzle[row][col])
+
+    def set(self, row: int, col: int, n: int) -> set:
+        """
+        Changes the digit of a cell (None clears it) and updates the counters.
+
+        Returns:
+            set: The cells whose conflict status may have changed.
+        """
+        old = self.player[row][col]
+        if old == n:
+            return set()
+        cell = (row, col)
+        units = self.units(row, col)
+        touched = {cell}
+        if old is not None:
+            self.counts[old] -= 1
+            for unit in units:
+                places = self._places[(unit, old)]
+                places.discard(cell)
+                touched |= places
+        self.player[row][col] = n
+        if n is not None:
+            self.counts[n] += 1
+            for unit in units:
+                places = self._places.setdefault((unit, n), set())
+                places.add(cell)
+                touched |= places
+        self.update_Candidates(row, col, old, n)
+        if cell in self.blanks:
+            self.correct += (n == self.solution[row][col]) - (old == self.solution[row][col])
+            if n is None or n == self.solution[row][col]:
+                self.wrong.discard(cell)
+            else:
+                self.wrong.add(cell)
+        for (r, c) in touched:
+            if self.in_conflict(r, c):
+                self.conflicts.add((r, c))
+            else:
+                self.conflicts.discard((r, c))
+        return touched
+
+    def update_Candidates(self, row: int, col: int, old: int, n: int):
+        """Updates the candidates of (row, col) and its peers after its digit changed from `old` to `n`."""
+        size, player, candidates = self.size, self.player, self.candidates
+        if old is not None:
+            bit = 1 << old
+            for (r, c) in self._peers[row][col]:
+                if player[r][c] is None and not any(self._places.get((unit, old)) for unit in self._unit_of[r][c]):
+                    candidates[r*size + c] |= bit
+        if n is not None:
+            bit = ~(1 << n)
+            for (r, c) in self._peers[row][col]:
+                candidates[r*size + c] &= bit
+            candidates[row*size + col] = 0
+        else:
+            used = 0
+            for unit in self._unit_of[row][col]:
+                for d in range(1, size + 1):
+                    if self._places.get((unit, d)):
+                        used |= 1 << d
+            candidates[row*size + col] = geometry(self.box)["full"] & ~used
+
+    def deduce(self) -> dict:
+        """
+        Finds the next hint for the player's board: a mistake to fix or the easiest logical deduction.
+
+        Mistakes come first, one wrong cell at a time, since no deduction can be trusted on a wrong
+        board. Otherwise `find_Deduction` runs on the maintained candidates minus the ones excluded
+        by earlier hints, and the candidates the deduction eliminates are excluded in turn, so the 
+        next call moves on.
+        Deductions are only available on 9x9 boards.
+
+        Returns:
+            dict: The deduction of `find_Deduction` with its cells as (row, col) and its `place` and
+                  `eliminate` entries as (row, col, digit); a deduction with the "mistake" technique
+                  and one wrong cell in `cells`; or None on larger boards or when no technique applies.
+        """
+        if self.wrong:
+            r, c = min(self.wrong)
+            return {"technique": "mistake", "cells": [(r, c)], "digits": [], "unit": None, "place": None,
+                    "eliminate": [], "text": f"r{r + 1}c{c + 1} holds a wrong digit."}
+        if self.size != 9:
+            return None
+        values = [n or 0 for row in self.player for n in row]
+        deduction = find_Deduction(values, [c & ~x for c, x in zip(self.candidates, self.excluded)])
+        if deduction is None:
+            return None
+        for (i, n) in deduction["eliminate"]:
+            self.excluded[i] |= 1 << n
+        deduction["cells"] = [divmod(i, 9) for i in deduction["cells"]]
+        deduction["eliminate"] = [divmod(i, 9) + (n,) for (i, n) in deduction["eliminate"]]
+        if deduction["place"] is not None:
+            deduction["place"] = divmod(deduction["place"][0], 9) + (deduction["place"][1],)
+        return deduction
+
+    def hint(self, selected: tuple = None, rng: random.Random = None) -> tuple:
+        """
+        Chooses what a hint shows and which cell, if any, it reveals.
+
+        The hint shows the result of `deduce`. It reveals the cell of a deduction that places a 
+        digit; flagging a mistake or eliminating candidates reveals nothing. When there is no 
+        deduction, it reveals `selected` if that cell is still blank, or else a random blank cell.
+        Hints that reveal a cell or flag a mistake are meant to cost the player a hint, so the 
+        hint cannot be used to find wrong cells for free; eliminations are free.
+
+        Args:
+            selected (tuple): The (row, col) cell selected by the player, or None.
+            rng (random.Random): The generator choosing a random blank cell (defaults to the global `random` module).
+
+        Returns:
+            tuple: The deduction of `deduce` (or None) and the (row, col) cell to `reveal` (or None).
+        """
+        deduction = self.deduce()
+        if deduction is not None:
+            return deduction, deduction["place"][:2] if deduction["place"] is not None else None
+        if selected in self.blanks:
+            return None, selected
+        return None, (rng or random).choice(sorted(self.blanks)) if self.blanks else None
+
+    def in_conflict(self, row: int, col: int) -> bool:
+        """Returns True if the digit of (row, col) also appears elsewhere in its row, column or box."""
+        n = self.player[row][col]
+        if n is None:
+            return False
+        return any(len(self._places[(unit, n)]) > 1 for unit in self.units(row, col))
+
+    def units(self, row: int, col: int) -> tuple:
+        """Returns the numbers of the row, column and box units of (row, col)."""
+        return self._unit_of[row][col]
+
+    def cells_of(self, n: int) -> set:
+        """Returns the cells holding the digit `n`."""
+        cells = set()
+        for row in range(self.size):
+            cells |= self._places.get((row, n), set())
+        return cells
+
+    def reveal(self, row: int, col: int) -> set:
+        """Fills (row, col) with the solution's digit and turns it into a given cell, as a hint does."""
+        self.history.append(self.encode(row, col, self.player[row][col], self.solution[row][col], hint=True))
+        self.future.clear()
+        touched = self.set(row, col, self.solution[row][col])
+        if (row, col) in self.blanks:
+            self.blanks.discard((row, col))
+            self.hinted.add((row, col))
+            self.correct -= 1
+        return touched
+
+    def play(self, row: int, col: int, n: int) -> set:
+        """Changes a cell like `set` and records the move for `undo`; returns the touched cells."""
+        old = self.player[row][col]
+        if old == n:
+            return set()
+        self.history.append(self.encode(row, col, old, n))
+        self.future.clear()
+        return self.set(row, col, n)
+
+    def undo(self) -> tuple:
+        """
+        Takes back the last move. Hints are final, so the history cannot be undone past one.
+
+        Returns:
+            tuple: The (row, col) of the move, the digit now in the cell (None if empty) and the 
+                   touched cells, or None if there is nothing to undo.
+        """
+        if not self.history or self.history[-1] >> 20:
+            return None
+        code = self.history.pop()
+        self.future.append(code)
+        row, col, old, new = self.decode(code)
+        return row, col, old, self.set(row, col, old)
+
+    def redo(self) -> tuple:
+        """Plays the last undone move again; returns the same tuple as `undo`, or None."""
+        if not self.future:
+            return None
+        code = self.future.pop()
+        self.history.append(code)
+        row, col, old, new = self.decode(code)
+        return row, col, new, self.set(row, col, new)
+
+    def encode(self, row: int, col: int, old: int, new: int, hint: bool = False) -> int:
+        """Packs a move into an int: cell in bits 0-9, old digit in 10-14, new digit in 15-19, hint flag in bit 20."""
+        return (row*self.size + col) | (old or 0) << 10 | (new or 0) << 15 | hint << 20
+
+    def decode(self, code: int) -> tuple:
+        """Unpacks a move from `encode` into (row, col, old, new), with None for an empty cell."""
+        row, col = divmod(code & 1023, self.size)
+        return row, col, (code >> 10 & 31) or None, (code >> 15 & 31) or None
+
+    def progress(self) -> int:
+        """Returns the percentage of blank cells holding the solution's digit."""
+        return round(100*self.correct/len(self.blanks)) if self.blanks else 100
+
+    def is_complete(self) -> bool:
+        """Returns True if every blank cell holds the solution's digit."""
+        return self.correct == len(self.blanks)
+
+    def is_used_up(self, n: int) -> bool:
+        """Returns True if the digit `n` has been placed once in every row."""
+        return self.counts[n] >= self.size
+
+SESSION_HEADER = struct.Struct("<4sBBBHHHH")  # magic, version, box, level, hint, mistake, history, future
+
+def save_Session(state: GameState, level: str, hint: int, mistake: int) -> bytes:
+    """
+    Encodes a game in progress as a compact binary snapshot.
+
+    After a fixed header come two bitmasks (given cells and hinted cells), the solution and the
+    player grid (4 bits per cell for 9x9 boards, a byte per cell otherwise) and the undo and redo
+    moves, three bytes each. A 9x9 game without moves takes 119 bytes.
+
+    Args:
+        state (GameState): The state of the game.
+        level (str): The difficulty level of the game.
+        hint (int): The number of hints remaining.
+        mistake (int): The current count of mistakes.
+
+    Returns:
+        bytes: The snapshot, read back by `load_Session`.
+
+    Raises:
+        ValueError: If a count or the move history does not fit in its 2-byte header field.
+    """
+    if max(hint, mistake, len(state.history), len(state.future)) > 0xFFFF or min(hint, mistake) < 0:
+        raise ValueError("game too long for a session snapshot")
+    size = state.size
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    given = sum(1 << i for i, cell in enumerate(cells) if cell not in state.blanks and cell not in state.hinted)
+    hinted = sum(1 << i for i, cell in enumerate(cells) if cell in state.hinted)
+    solution = bytes(state.solution[r][c] for (r, c) in cells)
+    player = bytes(state.player[r][c] or 0 for (r, c) in cells)
+    if size == 9:
+        solution, player = pack_Nibbles(solution), pack_Nibbles(player)
+    masks = (size * size + 7) // 8
+    header = SESSION_HEADER.pack(b"SDKS", 1, state.box, list(LEVELS).index(level), hint, mistake,
+                                 len(state.history), len(state.future))
+    moves = b"".join(code.to_bytes(3, "little") for code in state.history + state.future)
+    return header + given.to_bytes(masks, "little") + hinted.to_bytes(masks, "little") + solution + player + moves
+
+def load_Session(raw: bytes) -> dict:
+    """
+    Decodes a snapshot from `save_Session`.
+
+    Args:
+        raw (bytes): The snapshot.
+
+    Returns:
+        dict: The `level`, `hint` and `mistake` counts, the original `puzzle` grid and the 
+              restored `state` (a `GameState` with its undo and redo history).
+
+    Raises:
+        ValueError: If `raw` is not a session snapshot, or is truncated or corrupt.
+    """
+    if len(raw) < SESSION_HEADER.size:
+        raise ValueError("not a session snapshot")
+    magic, version, box, level, hint, mistake, done, undone = SESSION_HEADER.unpack_from(raw)
+    if magic != b"SDKS" or version != 1 or box not in (3, 4, 5) or level >= len(LEVELS):
+        raise ValueError("not a session snapshot")
+    size = box * box
+    masks = (size * size + 7) // 8
+    grid = 41 if size == 9 else size * size
+    offset = SESSION_HEADER.size
+    expected = offset + 2 * masks + 2 * grid + 3 * (done + undone)
+    if len(raw) != expected:
+        raise ValueError(f"session snapshot of {len(raw)} bytes, expected {expected}")
+    given = int.from_bytes(raw[offset:offset + masks], "little")
+    hinted = int.from_bytes(raw[offset + masks:offset + 2*masks], "little")
+    offset += 2 * masks
+    solution, player = raw[offset:offset + grid], raw[offset + grid:offset + 2*grid]
+    if size == 9:
+        solution, player = unpack_Nibbles(solution), unpack_Nibbles(player)
+    if not all(1 <= n <= size for n in solution[:size * size]) or max(player[:size * size]) > size:
+        raise ValueError("corrupt session snapshot")
+    offset += 2 * grid
+    codes = [int.from_bytes(raw[i:i + 3], "little") for i in range(offset, offset + 3*(done + undone), 3)]
+    if any(code & 1023 >= size * size or code >> 10 & 31 > size or code >> 15 & 31 > size for code in codes):
+        raise ValueError("corrupt session snapshot")
+    solution = [list(solution[r*size:(r + 1)*size]) for r in range(size)]
+    puzzle = [[solution[r][c] if given >> (r*size + c) & 1 else None for c in range(size)] for r in range(size)]
+    shown = [[solution[r][c] if (given | hinted) >> (r*size + c) & 1 else None for c in range(size)] for r in range(size)]
+    blanks = [(r, c) for r in range(size) for c in range(size) if shown[r][c] is None]
+    state = GameState(solution, shown, blanks)
+    state.hinted = {(r, c) for r in range(size) for c in range(size) if hinted >> (r*size + c) & 1}
+    for (r, c) in blanks:
+        if player[r*size + c]:
+            state.set(r, c, player[r*size + c])
+    state.history, state.future = codes[:done], codes[done:]
+    return {"level": list(LEVELS)[level], "hint": hint, "mistake": mistake, "puzzle": puzzle, "state": state}
+
+def write_Sessions(path: str, sessions: dict):
+    """
+    Writes named snapshots to a session store, replacing the file atomically.
+
+    Each record is the name length (1 byte), the UTF-8 name, the snapshot length (2 bytes) and 
+    the snapshot.
+
+    Args:
+        path (str): The store file.
+        sessions (dict): The snapshots from `save_Session` by name.
+
+    Raises:
+        ValueError: If a name is longer than 255 bytes or a snapshot than 65535 bytes; the file 
+                    is then left untouched.
+    """
+    records = []
+    for name, raw in sessions.items():
+        name = name.encode("utf-8")
+        if len(name) > 0xFF or len(raw) > 0xFFFF:
+            raise ValueError("session name or snapshot too long for the session store")
+        records.append(len(name).to_bytes(1, "little") + name + len(raw).to_bytes(2, "little") + raw)
+    with open(path + ".tmp", "wb") as file:
+        file.write(b"".join(records))
+    os.replace(path + ".tmp", path)
+
+def read_Sessions(path: str) -> dict:
+    """
+    Reads every snapshot of a session store in one pass; returns them by name ({} if the file is missing).
+
+    Raises:
+        ValueError: If a record is truncated or its name is not valid UTF-8.
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return {}
+    sessions, offset = {}, 0
+    while offset < len(data):
+        length = data[offset]
+        if offset + 3 + length > len(data):
+            raise ValueError("truncated session store")
+        try:
+            name = data[offset + 1:offset + 1 + length].decode("utf-8")
+        except UnicodeDecodeError:
+            raise ValueError("corrupt session name") from None
+        offset += 1 + length
+        size = int.from_bytes(data[offset:offset + 2], "little")
+        if offset + 2 + size > len(data):
+            raise ValueError("truncated session store")
+        sessions[name] = data[offset + 2:offset + 2 + size]
+        offset += 2 + size
+    return sessions
@@ -0,0 +1,436 @@
+from collections import deque
+import functools
+import math
+import random
+import threading
+import time
+from . import instrument
+from .board import Board, LEVELS, geometry, grid_Box
+from .formats import pack_Grid
+from .instrument import count_Event, record_Search, time_Call
+from .solver import count_Solutions, get_Solver, propagate_Board, select_Cell
+from .grader import TECHNIQUES, grade_Puzzle
+from .symmetry import canonical_Key, transform_Puzzle
+
+MASK_DIGITS = [[n for n in range(1, 10) if mask >> n & 1] for mask in range(1 << 10)]  # the digits of each 9x9 candidate mask
+SEEDED_TRIES = 20  # puzzles started by a seeded `make_Puzzle` before it keeps the one graded closest to the level
+
+@time_Call()
+def generate_Sudoku(data: list, solver: str = None, rng: random.Random = None) -> bool:
+    """
+    Generate a valid Sudoku board using backtracking.
+
+    This function attempts to fill the empty cells in the `data` grid with numbers 
+    from 1 to 9 using backtracking. The search runs on a `Board`, so the numbers that do
+    not violate Sudoku rules are read from the row, column and box bitmasks. If a placement 
+    leads to a valid solution, it returns True and writes the filled cells back to `data`;
+    otherwise, it backtracks and leaves `data` unchanged. Plain backtracking does not scale 
+    past 9x9, so larger grids fill their independent diagonal boxes at random and finish with
+    the search of the solver backend (`search_Board` or `search_DLX`) in random digit order. 
+    The "dlx" backend is used that way for 9x9 grids too.
+
+    Args:
+        data (list): A 9x9 (or 16x16, 25x25) list representing the Sudoku grid (with None for 
+                     empty cells), or a `bytearray` board in the byte format of `parse_Line`
+                     (0 for empty cells), filled in place the same way.
+        solver (str): The backend of `SOLVERS` to use (defaults to the one selected by `use_Solver`).
+        rng (random.Random): The generator drawing every random choice (defaults to the global 
+                             `random` module); the same seeded generator gives the same grid.
+
+    Returns:
+        bool: True if the grid is successfully filled, False if no valid placement is possible.
+
+    Raises:
+        TypeError: If `data` is an immutable `bytes` board, which cannot be filled in place.
+    """
+    if isinstance(data, bytes):
+        raise TypeError("generate_Sudoku fills the grid in place: pass a bytearray, not bytes")
+    board = Board(data)
+    size = board.size
+    flat = isinstance(data, bytearray)
+    if flat:
+        empty = [divmod(index, size) for index, n in enumerate(data) if not n]
+    else:
+        empty = [(row, col) for row in range(size) for col in range(size) if data[row][col] is None]
+    backend = get_Solver(solver)
+    stats = {"nodes": 0, "backtracks": 0, "depth": 0}
+    if board.box == 3 and backend["name"] == "propagate":
+        filled = fill_Board(board, empty, rng=rng, stats=stats if instrument.Profiling else None)
+        record_Search("generate_Sudoku", stats)
+        if not filled:
+            return False
+    else:
+        if len(empty) == size * size:
+            for start in range(0, size, board.box):
+                nums = list(range(1, size + 1))
+                (rng or random).shuffle(nums)
+                for index, n in enumerate(nums):
+                    board.set(start + index // board.box, start + index % board.box, n)
+        board = backend["search"](board, stats, randomize=True, rng=rng)
+        record_Search("generate_Sudoku", stats)
+        if board is None:
+            return False
+    for (row, col) in empty:
+        if flat:
+            data[row*size + col] = board.cells[row][col]
+        else:
+            data[row][col] = board.cells[row][col]
+    return True
+
+def fill_Board(board: Board, empty: list, index: int = 0, rng: random.Random = None, stats: dict = None) -> bool:
+    """
+    Fills the empty cells of a `Board` in the given order using randomized backtracking.
+
+    The search is an explicit loop over `empty` rather than a recursion: each position keeps the
+    bitmask of the digits it has not tried yet, and a random one of them is drawn with a single
+    `random()` call instead of shuffling a candidate list, so most cells cost a few integer
+    operations.
+
+    Args:
+        board (Board): The board to fill in place.
+        empty (list): The (row, col) coordinates of the empty cells, in filling order.
+        index (int): The position in `empty` to continue from.
+        rng (random.Random): The generator drawing the candidates (defaults to the global `random` module).
+        stats (dict): Optional `nodes`, `backtracks` and `depth` (most cells filled) counters, updated during the search.
+
+    Returns:
+        bool: True if every cell from `index` onward was filled, False otherwise.
+    """
+    rows, cols, boxes, cells = board.rows, board.cols, board.boxes, board.cells
+    shape = geometry(board.box)
+    box_of, full = shape["box_of"], shape["full"]
+    digits = MASK_DIGITS if board.size == 9 else None
+    draw = (rng or random).random
+    spots = [(r, c, box_of[r][c]) for (r, c) in empty]
+    untried = [0] * len(spots)
+    start, end, nodes, backtracks, deepest = index, len(spots), 0, 0, index
+    fresh = True
+    while index < end:
+        r, c, b = spots[index]
+        if fresh:
+            mask = full & ~(rows[r] | cols[c] | boxes[b])
+            nodes += 1
+        else:
+            bit = 1 << cells[r][c]
+            rows[r] ^= bit
+            cols[c] ^= bit
+            boxes[b] ^= bit
+            cells[r][c] = None
+            mask = untried[index]
+            backtracks += 1
+        if mask:
+            nums = digits[mask] if digits else [n for n in range(1, board.size + 1) if mask >> n & 1]
+            n = nums[int(draw() * len(nums))]
+            bit = 1 << n
+            untried[index] = mask ^ bit
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            cells[r][c] = n
+            index += 1
+            if index > deepest:
+                deepest = index
+            fresh = True
+        else:
+            index -= 1
+            fresh = False
+            if index < start:
+                break
+    if stats is not None:
+        stats["nodes"] += nodes + (index == end)
+        stats["backtracks"] += backtracks
+        stats["depth"] = max(stats["depth"], deepest)
+    return index == end
+
+@time_Call()
+def remove_Clues(data: list, num: int, time_limit: float = 1.0, max_attempts: int = None,
+                 rng: random.Random = None, singles: bool = False) -> tuple:
+    """
+    Blanks cells of a solved grid while keeping the puzzle's solution unique.
+
+    Cells are tried in random order; a cell stays blank only if `count_Solutions` still finds 
+    exactly one solution, a search skipped when `has_Single` shows the cell is forced anyway. The loop ends when `num` cells are blank, after `max_attempts` cells 
+    have been tried, or once `time_limit` seconds have passed, so the result may have fewer 
+    than `num` blanks on a hard budget. With `singles`, a cell stays blank only if naked and 
+    hidden singles alone still solve the puzzle: a stricter test whose cost is bounded, so 
+    large grids can be built without a time limit.
+
+    Args:
+        data (list): The fully solved grid. It is not modified.
+        num (int): The number of cells to blank.
+        time_limit (float): The time budget in seconds.
+        max_attempts (int): The maximum number of cells to try (all cells by default).
+        rng (random.Random): The generator ordering the cells (defaults to the global `random` module).
+        singles (bool): Whether to test uniqueness with `propagate_Board` instead of `count_Solutions`.
+
+    Returns:
+        tuple: The puzzle grid with blanks set to None and the sorted list of blanked (row, col) cells.
+    """
+    deadline = time.perf_counter() + time_limit
+    puzzle = [row[:] for row in data]
+    cells = [(r, c) for r in range(len(data)) for c in range(len(data))]
+    (rng or random).shuffle(cells)
+    location = []
+    attempts = 0
+    for (r, c) in cells[:max_attempts]:
+        if len(location) >= num or time.perf_counter() > deadline:
+            break
+        puzzle[r][c] = None
+        if has_Single(puzzle, r, c):
+            unique = True
+        elif singles:
+            board = Board(puzzle)
+            unique = propagate_Board(board) and select_Cell(board) is None
+        else:
+            unique = count_Solutions(puzzle) == 1
+        if unique:
+            location.append((r, c))
+        else:
+            puzzle[r][c] = data[r][c]
+        attempts += 1
+    count_Event("remove_Clues.attempts", attempts)
+    count_Event("remove_Clues.blanks", len(location))
+    return puzzle, sorted(location)
+
+def has_Single(puzzle: list, row: int, col: int) -> bool:
+    """
+    Returns True if the peers of the empty cell (row, col) hold every digit but one.
+
+    Blanking such a cell keeps a unique puzzle unique, since the cell can only take its old digit,
+    so clue removal can skip the solution count.
+    """
+    peers = geometry(grid_Box(puzzle))["peers"][row][col]
+    digits = {puzzle[r][c] for (r, c) in peers}
+    digits.discard(None)
+    return len(digits) == len(puzzle) - 1
+
+@time_Call()
+def make_Puzzle(level: str, time_limit: float = 1.0, box: int = 3, seed=None) -> tuple:
+    """
+    Builds a new puzzle for a difficulty level.
+
+    The number of blanks is drawn from the level's range in `LEVELS`; `generate_Sudoku` fills
+    the solution and `remove_Clues` blanks cells while keeping the solution unique. The blank 
+    count is only a floor: while `grade_Puzzle` rates the puzzle below the level, more cells are
+    blanked, skipping any removal that would break uniqueness or overshoot the level. If the 
+    puzzle runs out of such cells, or already grades above the level, a new one is started until
+    one grades exactly at the level; once `time_limit` seconds have passed, the puzzle whose 
+    grade is closest to the level (the easier one on a tie) is kept.
+
+    The grader only knows 9x9 grids: for 16x16 and 25x25 grids the level's blank count is 
+    scaled to the number of cells, and clue removal uses the bounded `singles` test of 
+    `remove_Clues` (a single `count_Solutions` call on a sparse 25x25 grid can run for minutes),
+    with `time_limit` scaled to the number of cells as well. 16x16 puzzles reach the scaled 
+    count; 25x25 Expert puzzles stop short of it (about 358 blanks for 394), at the most blanks
+    singles alone can still solve.
+
+    With a `seed`, every random choice is drawn from a `random.Random` of its own, seeded from 
+    the level, box and seed, and the clock is left out: up to `SEEDED_TRIES` puzzles are started
+    instead of running for `time_limit` seconds. The same (level, seed, box) then always gives the same 
+    puzzle for a given solver backend, in any process and whatever else draws random numbers.
+
+    Args:
+        level (str): The difficulty level ("Easy", "Medium", "Hard", or "Expert").
+        time_limit (float): The time budget in seconds for reaching the graded level.
+        box (int): The side of a box in cells (3 for 9x9, 4 for 16x16, 5 for 25x25).
+        seed: An int or str making the puzzle reproducible (None draws from the global `random` module).
+
+    Returns:
+        tuple: The solved grid, the puzzle grid and the sorted list of blank (row, col) cells.
+    """
+    rng = random if seed is None else random.Random(f"{level}-{box}-{seed}")
+    tries = math.inf if seed is None else SEEDED_TRIES
+    if seed is not None:
+        time_limit = math.inf
+    if box != 3:
+        size = box * box
+        num = round(LEVELS[level]["location"] * size * size / 81)
+        data = [[None]*size for _ in range(size)]
+        generate_Sudoku(data, rng=rng)
+        puzzle, location = remove_Clues(data, rng.randrange(num, num + 5, 2), time_limit * size * size / 81,
+                                        rng=rng, singles=True)
+        return data, puzzle, location
+    target = list(LEVELS).index(level)
+    deadline = time.perf_counter() + time_limit
+    best, best_tier = None, -1
+    while best_tier != target and time.perf_counter() <= deadline and tries > 0:
+        tries -= 1
+        count_Event("make_Puzzle.grids")
+        num = rng.randrange(LEVELS[level]["location"], LEVELS[level]["location"]+5, 2)
+        data = [[None]*9 for _ in range(9)]
+        generate_Sudoku(data, rng=rng)
+        puzzle, location = remove_Clues(data, num, time_limit, rng=rng)
+        tier = TECHNIQUES[grade_Puzzle(puzzle)["hardest"]]
+        cells = [(r, c) for r in range(9) for c in range(9) if puzzle[r][c] is not None]
+        rng.shuffle(cells)
+        for (r, c) in cells:
+            if tier >= target or time.perf_counter() > deadline:
+                break
+            puzzle[r][c] = None
+            count_Event("make_Puzzle.graded_attempts")
+            if has_Single(puzzle, r, c) or count_Solutions(puzzle) == 1:
+                new_tier = TECHNIQUES[grade_Puzzle(puzzle)["hardest"]]
+                if new_tier <= target:
+                    location.append((r, c))
+                    tier = new_tier
+                    continue
+            puzzle[r][c] = data[r][c]
+        if best is None or (abs(tier - target), tier) < (abs(best_tier - target), best_tier):
+            best, best_tier = (data, puzzle, sorted(location)), tier
+    return best
+
+def load_Puzzle(level: str, seed, box: int = 3) -> tuple:
+    """
+    Returns the puzzle of a (level, seed) pair, as built by `make_Puzzle` with that seed.
+
+    Puzzles are rebuilt on demand behind an LRU cache, so a seed can be stored or sent in place
+    of a puzzle. The cache also keys on the selected solver backend, which shapes the solution.
+
+    Args:
+        level (str): The difficulty level ("Easy", "Medium", "Hard", or "Expert").
+        seed: The int or str seed of the puzzle.
+        box (int): The side of a box in cells (3 for 9x9, 4 for 16x16, 5 for 25x25).
+
+    Returns:
+        tuple: New lists of the solved grid, the puzzle grid and the blank (row, col) cells.
+    """
+    data, puzzle, location = cache_Puzzle(level, seed, box, get_Solver()["name"])
+    return [list(row) for row in data], [list(row) for row in puzzle], list(location)
+
+@functools.lru_cache(maxsize=1024)
+def cache_Puzzle(level: str, seed, box: int, solver: str) -> tuple:
+    """Builds the seeded puzzle of `load_Puzzle` as immutable tuples; `solver` only keys the cache."""
+    data, puzzle, location = make_Puzzle(level, box=box, seed=seed)
+    return tuple(map(tuple, data)), tuple(map(tuple, puzzle)), tuple(location)
+
+class PuzzlePool:
+    """
+    Per-level stock of ready puzzles, refilled by a background thread.
+
+    `get` hands out a pre-generated puzzle when one is available (a hit). When the level's stock
+    is empty (a miss), it applies a random `transform_Puzzle` to one of the last puzzles built
+    for the level, which costs microseconds and keeps the difficulty. If there is none yet, a 
+    blocking `get` builds a puzzle on the calling thread, while `get(level, wait=False)` queues the
+    level for the worker and returns None, so a GUI can poll instead of freezing. Each `get` wakes
+    the worker, which builds the queued levels first and otherwise tops the levels back up to 
+    `depth` puzzles, always refilling the level with the fewest ready puzzles first.
+    Built 9x9 puzzles are indexed by `canonical_Key`, and one that is equivalent to a puzzle built
+    before is dropped; larger puzzles are indexed by their byte board, which only catches repeats.
+
+    Puzzles are built from seeds drawn from the pool's own generator, so the refill thread never
+    touches the global `random` state of the game, and a seeded pool draws the same seeds for
+    each level on every run.
+
+    Attributes:
+        depth (int): The number of puzzles to keep ready per level.
+        box (int): The side of a box of the puzzles built (3 for 9x9, 4 for 16x16, 5 for 25x25).
+        puzzles (dict): A deque of (solution, puzzle, location) tuples per level.
+        hits (int): The number of `get` calls served from the pool.
+        misses (int): The number of `get` calls that found the level's stock empty (a level 
+                      polled while queued counts once).
+        duplicates (int): The number of built puzzles dropped as equivalent to an earlier one.
+        seeds (dict): A `random.Random` per level drawing the seeds and transforms of its puzzles.
+        bases (dict): A deque of the last `BASES` puzzles built per level, transformed on a miss.
+        keys (set): The `canonical_Key` (or byte board) of every puzzle built.
+    """
+    BASES = 32
+
+    def __init__(self, depth: int = 2, levels: dict = LEVELS, seed=None, box: int = 3):
+        self.depth = depth
+        self.box = box
+        self.seeds = {level: random.Random(None if seed is None else f"{level}-{seed}") for level in levels}
+        self._lock = threading.Lock()
+        self.puzzles = {level: deque() for level in levels}
+        self.bases = {level: deque(maxlen=self.BASES) for level in levels}
+        self.keys = set()
+        self.hits = 0
+        self.misses = 0
+        self.duplicates = 0
+        self._wanted = deque()  # levels a non-blocking `get` found nothing for, built first
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Starts the background refill thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._refill, name="PuzzlePool", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """
+        Stops the background refill thread once its current puzzle is finished.
+
+        Args:
+            wait (bool): Whether to join the thread. With False the thread is only told to stop, so
+                         a closing window does not wait for a puzzle being built; being a daemon, 
+                         it ends with the process anyway.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            if wait:
+                self._thread.join()
+            self._thread = None
+
+    def get(self, level: str, wait: bool = True) -> tuple:
+        """
+        Returns a (solution, puzzle, location) tuple for `level`, transforming or generating one if the pool is empty.
+
+        With `wait` False, a level with neither a ready puzzle nor a base is queued for the refill
+        thread (which must be started) and None is returned instead of building on the calling 
+        thread; calling again later returns the puzzle once it is built.
+        """
+        try:
+            puzzle = self.puzzles[level].popleft()
+            self.hits += 1
+        except IndexError:
+            with self._lock:
+                queued = level in self._wanted
+                base = self.seeds[level].choice(self.bases[level]) if self.bases[level] else None
+                puzzle = transform_Puzzle(base[0], base[1], self.seeds[level]) if base else None
+                if puzzle is None and not wait and not queued:
+                    self._wanted.append(level)
+            if not queued:
+                self.misses += 1
+            if puzzle is None:
+                if not wait:
+                    self._wake.set()
+                    return None
+                puzzle = make_Puzzle(level, box=self.box, seed=self.next_Seed(level))
+                self.add(level, puzzle)
+        with self._lock:
+            if level in self._wanted:
+                self._wanted.remove(level)
+        self._wake.set()
+        return puzzle
+
+    def add(self, level: str, puzzle: tuple) -> bool:
+        """Indexes a built puzzle and keeps it as a base of `level`; returns False if it is a duplicate."""
+        key = canonical_Key(puzzle[1]) if self.box == 3 else pack_Grid(puzzle[1])
+        with self._lock:
+            if key in self.keys:
+                self.duplicates += 1
+                return False
+            self.keys.add(key)
+            self.bases[level].append(puzzle)
+        return True
+
+    def next_Seed(self, level: str) -> int:
+        """Draws the seed of the next puzzle of `level`, from the calling thread or the refill thread."""
+        with self._lock:
+            return self.seeds[level].getrandbits(64)
+
+    def _refill(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            with self._lock:
+                wanted = [l for l in self._wanted if not self.puzzles[l]]
+            level = wanted[0] if wanted else min(self.puzzles, key=lambda l: len(self.puzzles[l]))
+            if len(self.puzzles[level]) >= self.depth:
+                self._wake.wait()
+            else:
+                puzzle = make_Puzzle(level, box=self.box, seed=self.next_Seed(level))
+                if self.add(level, puzzle):
+                    self.puzzles[level].append(puzzle)
@@ -0,0 +1,247 @@
+from .board import Board, DIGITS, FULL_MASK, UNIT_CELLS, PEER_CELLS, LEVELS
+from .formats import pack_Grid
+from .instrument import time_Call
+from .solver import search_Board
+
+INTERSECTIONS = [(UNIT_CELLS[a], set(UNIT_CELLS[a]) & set(UNIT_CELLS[b]), UNIT_CELLS[b])
+                 for a in range(27) for b in range(27)
+                 if (a < 18) != (b < 18) and set(UNIT_CELLS[a]) & set(UNIT_CELLS[b])]  # (line, shared, box) and (box, shared, line)
+TECHNIQUES = {"hidden single": 0, "hidden single (line)": 1, "naked single": 1, "locked candidates": 2,
+              "naked pair": 2, "hidden pair": 3, "x-wing": 3, "guess": 3}  # technique -> difficulty tier (index in LEVELS)
+
+@time_Call()
+def grade_Puzzle(grid) -> dict:
+    """
+    Rates a puzzle by the solving techniques a human needs, not by its number of blanks.
+
+    The puzzle is solved step by step on candidate bitmasks, always applying the simplest
+    technique of `TECHNIQUES` that makes progress: hidden singles (in a box, then in a row or
+    column), naked singles, locked candidates 
+    (pointing and claiming), naked and hidden pairs, and X-wings. If logic gets stuck, the rest 
+    is finished by `search_Board` and each node it visits is counted as a guess. The hardest 
+    technique used decides the level.
+
+    Args:
+        grid (list): A 9x9 list representing the Sudoku puzzle (with None for empty cells), or 
+                     an 81-byte board from `parse_Line`.
+
+    Returns:
+        dict: The number of times each technique was applied (`techniques`), the `hardest` one,
+              the number of `guesses` and the matching difficulty `level`.
+    """
+    raw = grid if isinstance(grid, (bytes, bytearray)) else pack_Grid(grid)
+    values = list(raw)
+    cand = [0]*81
+    for i in range(81):
+        if not values[i]:
+            used = 0
+            for p in PEER_CELLS[i]:
+                used |= 1 << values[p]
+            cand[i] = FULL_MASK & ~used
+    counts = {}
+    hardest = "hidden single"
+    while 0 in values:
+        for step in STEPS:
+            name = step(values, cand)
+            if name:
+                counts[name] = counts.get(name, 0) + 1
+                if TECHNIQUES[name] > TECHNIQUES[hardest]:
+                    hardest = name
+                break
+        else:
+            break
+    guesses = 0
+    if 0 in values:
+        stats = {"nodes": 0, "backtracks": 0}
+        search_Board(Board(bytes(values)), stats)
+        guesses = stats["nodes"]
+        counts["guess"] = guesses
+        hardest = "guess"
+    return {"techniques": counts, "hardest": hardest, "guesses": guesses,
+            "level": list(LEVELS)[TECHNIQUES[hardest]]}
+
+def find_Deduction(values: list, cand: list) -> dict:
+    """
+    Finds the easiest logical deduction available on a board, for hints.
+
+    The techniques are tried in the order `grade_Puzzle` uses them, each on copies of `values`
+    and `cand`, and the first one that makes progress is described. Nothing is searched: the
+    steps only scan the 27 units, so a deduction takes well under a millisecond.
+
+    Args:
+        values (list): The 81 digits of the board (0 for empty cells).
+        cand (list): The 81 candidate bitmasks of the empty cells (0 for filled cells); they may
+                     already exclude digits ruled out by earlier deductions.
+
+    Returns:
+        dict: The `technique`, the `cells` of the pattern and its `digits` and `unit` (an index of
+              `UNIT_CELLS`, or None), the (index, digit) cell to `place` (or None), the (index, digit)
+              candidates to `eliminate`, and a `text` explaining it; None if no technique applies.
+    """
+    for step in STEPS:
+        new_values, new_cand, detail = values[:], cand[:], {}
+        name = step(new_values, new_cand, detail)
+        if name:
+            place = next(((i, new_values[i]) for i in range(81) if new_values[i] != values[i]), None)
+            eliminate = [] if place else [(i, n) for i in range(81) if cand[i] & ~new_cand[i]
+                                           for n in DIGITS if (cand[i] & ~new_cand[i]) >> n & 1]
+            detail.update(technique=name, place=place, eliminate=eliminate)
+            detail["text"] = describe_Deduction(detail)
+            return detail
+    return None
+
+def describe_Deduction(deduction: dict) -> str:
+    """Returns a sentence explaining a deduction of `find_Deduction`, with cells named like r3c5."""
+    def name(i: int) -> str:
+        return f"r{i // 9 + 1}c{i % 9 + 1}"
+    def names(cells) -> str:
+        return ", ".join(name(i) for i in cells)
+    unit = deduction["unit"]
+    where = None if unit is None else (f"row {unit + 1}", f"column {unit - 8}", f"box {unit - 17}")[unit // 9]
+    digits = ", ".join(map(str, deduction["digits"][:-1])) + " and " * (len(deduction["digits"]) > 1) + str(deduction["digits"][-1])
+    removed = names(sorted({i for (i, n) in deduction["eliminate"]}))
+    technique = deduction["technique"]
+    if technique.startswith("hidden single"):
+        return f"{digits} fits only {names(deduction['cells'])} in {where}."
+    if technique == "naked single":
+        return f"{names(deduction['cells'])} can only be {digits}."
+    if technique == "locked candidates":
+        pronoun = "it" if len(deduction["digits"]) == 1 else "them"
+        return f"In {where}, {digits} can only go in {names(deduction['cells'])}, so remove {pronoun} from {removed}."
+    if technique == "naked pair":
+        return f"{names(deduction['cells'])} can only hold {digits}, so remove them from {removed} in {where}."
+    if technique == "hidden pair":
+        return f"{digits} fit only {names(deduction['cells'])} in {where}, so remove their other candidates."
+    return (f"{digits} lies only in {names(deduction['cells'])} of two {deduction['lines']} (an X-wing), "
+            f"so remove it from {removed}.")
+
+def place_Candidate(values: list, cand: list, i: int, n: int):
+    """Places the digit `n` in cell `i` of a grading grid and removes it from the peers' candidates."""
+    values[i] = n
+    cand[i] = 0
+    bit = ~(1 << n)
+    for p in PEER_CELLS[i]:
+        cand[p] &= bit
+
+def step_Hidden_Single(values: list, cand: list, detail: dict = None) -> str:
+    """Places a digit that fits only one cell of a box, row or column."""
+    for unit in UNIT_CELLS[18:] + UNIT_CELLS[:18]:
+        seen = twice = 0
+        for i in unit:
+            twice |= seen & cand[i]
+            seen |= cand[i]
+        once = seen & ~twice
+        if once:
+            bit = once & -once
+            for i in unit:
+                if cand[i] & bit:
+                    place_Candidate(values, cand, i, bit.bit_length() - 1)
+                    if detail is not None:
+                        detail.update(cells=[i], digits=[bit.bit_length() - 1], unit=UNIT_CELLS.index(unit))
+                    return "hidden single" if unit in UNIT_CELLS[18:] else "hidden single (line)"
+    return None
+
+def step_Naked_Single(values: list, cand: list, detail: dict = None) -> str:
+    """Places the only candidate left in a cell."""
+    for i in range(81):
+        mask = cand[i]
+        if mask and not mask & (mask - 1):
+            place_Candidate(values, cand, i, mask.bit_length() - 1)
+            if detail is not None:
+                detail.update(cells=[i], digits=[mask.bit_length() - 1], unit=None)
+            return "naked single"
+    return None
+
+def step_Locked_Candidates(values: list, cand: list, detail: dict = None) -> str:
+    """Eliminates a digit confined to the intersection of a box and a row or column (pointing and claiming)."""
+    for (unit, shared, other) in INTERSECTIONS:
+        inside = outside = 0
+        for i in unit:
+            if i in shared:
+                inside |= cand[i]
+            else:
+                outside |= cand[i]
+        locked = inside & ~outside
+        if not locked:
+            continue
+        changed = False
+        for i in other:
+            if i not in shared and cand[i] & locked:
+                cand[i] &= ~locked
+                changed = True
+        if changed:
+            if detail is not None:
+                detail.update(cells=[i for i in unit if i in shared and cand[i] & locked],
+                              digits=[n for n in DIGITS if locked >> n & 1], unit=UNIT_CELLS.index(unit))
+            return "locked candidates"
+    return None
+
+def step_Naked_Pair(values: list, cand: list, detail: dict = None) -> str:
+    """Eliminates the two digits of two cells sharing the same two candidates from the rest of their unit."""
+    for unit in UNIT_CELLS:
+        pairs = {}
+        for i in unit:
+            if cand[i].bit_count() == 2:
+                pairs.setdefault(cand[i], []).append(i)
+        for mask, cells in pairs.items():
+            if len(cells) == 2:
+                changed = False
+                for i in unit:
+                    if i not in cells and cand[i] & mask:
+                        cand[i] &= ~mask
+                        changed = True
+                if changed:
+                    if detail is not None:
+                        detail.update(cells=cells, digits=[n for n in DIGITS if mask >> n & 1], unit=UNIT_CELLS.index(unit))
+                    return "naked pair"
+    return None
+
+def step_Hidden_Pair(values: list, cand: list, detail: dict = None) -> str:
+    """Strips the other candidates of two cells that are the only places for two digits of a unit."""
+    for unit in UNIT_CELLS:
+        places = {}
+        for n in DIGITS:
+            cells = tuple(i for i in unit if cand[i] >> n & 1)
+            if len(cells) == 2:
+                places.setdefault(cells, []).append(n)
+        for cells, nums in places.items():
+            if len(nums) == 2:
+                mask = 1 << nums[0] | 1 << nums[1]
+                changed = False
+                for i in cells:
+                    if cand[i] & ~mask:
+                        cand[i] &= mask
+                        changed = True
+                if changed:
+                    if detail is not None:
+                        detail.update(cells=list(cells), digits=nums, unit=UNIT_CELLS.index(unit))
+                    return "hidden pair"
+    return None
+
+def step_X_Wing(values: list, cand: list, detail: dict = None) -> str:
+    """Eliminates a digit confined to the same two columns of two rows (or the same two rows of two columns)."""
+    for n in DIGITS:
+        bit = 1 << n
+        for lines, cross in ((UNIT_CELLS[:9], UNIT_CELLS[9:18]), (UNIT_CELLS[9:18], UNIT_CELLS[:9])):
+            wings = {}
+            for index, line in enumerate(lines):
+                spots = tuple(k for k, i in enumerate(line) if cand[i] & bit)
+                if len(spots) == 2:
+                    wings.setdefault(spots, []).append(index)
+            for spots, found in wings.items():
+                if len(found) == 2:
+                    changed = False
+                    for k in spots:
+                        for index, i in enumerate(cross[k]):
+                            if index not in found and cand[i] & bit:
+                                cand[i] &= ~bit
+                                changed = True
+                    if changed:
+                        if detail is not None:
+                            detail.update(cells=sorted(lines[index][k] for index in found for k in spots), digits=[n],
+                                          unit=None, lines="rows" if lines[0] is UNIT_CELLS[0] else "columns")
+                        return "x-wing"
+    return None
+
+STEPS = (step_Hidden_Single, step_Naked_Single, step_Locked_Candidates, step_Naked_Pair, step_Hidden_Pair,
+         step_X_Wing)  # the techniques of `TECHNIQUES`, easiest first
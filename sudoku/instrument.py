@@ -0,0 +1,171 @@
+import contextlib
+import functools
+import math
+import sys
+import time
+
+Profiling = False  # whether the hooks below record anything; set by `start_Profile`
+COUNTERS = {}  # event name -> count
+TIMERS = {}  # phase name -> `LatencyStats`
+PROFILER = None  # the running `cProfile.Profile` of `start_Profile`, if any
+PROFILE_OUTPUT = None  # the file it is written to by `stop_Profile`
+NO_PHASE = contextlib.nullcontext()
+
+class LatencyStats:
+    """
+    Constant-memory latency summary based on a logarithmic histogram.
+
+    Every sample falls into a bucket about 2% wide, so percentiles are accurate to that 
+    resolution no matter how many samples are added.
+
+    Attributes:
+        count (int): The number of samples.
+        total (float): The sum of all samples in seconds.
+        buckets (dict): The number of samples per histogram bucket.
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = {}
+
+    def add(self, seconds: float):
+        """Records one sample, in seconds."""
+        self.count += 1
+        self.total += seconds
+        key = int(math.log1p(seconds * 1e6) * 50)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def percentile(self, p: float) -> float:
+        """Returns the upper bound in seconds of the bucket holding the `p`-th percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100) or 1
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                return math.expm1((key + 1) / 50) / 1e6
+        return 0.0
+
+    def summary(self) -> dict:
+        """Returns the count and the mean, p50, p90 and p99 latencies in milliseconds."""
+        return {"count": self.count,
+                "mean": 1000 * self.total / self.count if self.count else 0.0,
+                "p50": 1000 * self.percentile(50),
+                "p90": 1000 * self.percentile(90),
+                "p99": 1000 * self.percentile(99)}
+
+def count_Event(name: str, n: int = 1):
+    """
+    Adds `n` to the counter `name` while profiling.
+
+    Hot code checks `Profiling` itself before calling, so a disabled counter costs one global lookup.
+    """
+    if Profiling:
+        COUNTERS[name] = COUNTERS.get(name, 0) + n
+
+def record_Search(name: str, stats: dict):
+    """
+    Adds the counters of a search's `stats` (nodes, backtracks...) to the counters `name.<key>` while profiling.
+
+    A `depth` is the deepest level reached, so the largest one is kept instead of the sum.
+    """
+    if Profiling:
+        for key, value in stats.items():
+            counter = f"{name}.{key}"
+            COUNTERS[counter] = max(COUNTERS.get(counter, 0), value) if key == "depth" else COUNTERS.get(counter, 0) + value
+
+def time_Phase(name: str):
+    """
+    Returns a context manager recording the time spent in its block under `name` while profiling.
+
+    When profiling is off, the same shared `nullcontext` is returned, so a phase costs one call.
+    """
+    return PhaseTimer(name) if Profiling else NO_PHASE
+
+class PhaseTimer:
+    """Context manager of `time_Phase`, adding the duration of its block to `TIMERS[name]`."""
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        if self.name not in TIMERS:
+            TIMERS[self.name] = LatencyStats()
+        TIMERS[self.name].add(seconds)
+        return False
+
+def time_Call(name: str = None):
+    """
+    Decorator timing every call of a function (a UI handler, say) as a phase while profiling.
+
+    Args:
+        name (str): The phase name (defaults to the function name).
+    """
+    def decorate(func):
+        phase = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not Profiling:
+                return func(*args, **kwargs)
+            with PhaseTimer(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def start_Profile(output: str = None):
+    """
+    Clears the counters and timers and turns the instrumentation on.
+
+    Args:
+        output (str): Optional file receiving the `cProfile` statistics of everything run until 
+                      `stop_Profile`, readable with `pstats` or tools such as snakeviz.
+    """
+    global Profiling, PROFILER, PROFILE_OUTPUT
+    COUNTERS.clear()
+    TIMERS.clear()
+    Profiling = True
+    if output is not None:
+        import cProfile  # imported here: only profiling runs need it
+        PROFILER = cProfile.Profile()
+        PROFILER.enable()
+    PROFILE_OUTPUT = output
+
+def stop_Profile() -> dict:
+    """
+    Turns the instrumentation off and writes the `cProfile` output of `start_Profile`, if any.
+
+    Returns:
+        dict: The report of `report_Profile`.
+    """
+    global Profiling, PROFILER
+    Profiling = False
+    if PROFILER is not None:
+        PROFILER.disable()
+        PROFILER.dump_stats(PROFILE_OUTPUT)
+        PROFILER = None
+    return report_Profile()
+
+def report_Profile() -> dict:
+    """
+    Returns the recorded counters, and the count and mean, p50, p90 and p99 milliseconds of every phase.
+    """
+    return {"counters": dict(sorted(COUNTERS.items())),
+            "phases": {name: TIMERS[name].summary() for name in sorted(TIMERS)}}
+
+def print_Profile(report: dict, file=None):
+    """Prints a report of `report_Profile` as a table: one line per phase, then the counters."""
+    file = file or sys.stderr
+    print(f"{'phase':<28}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}", file=file)
+    for name, phase in report["phases"].items():
+        print(f"{name:<28}{phase['count']:>8}{phase['mean']:>10.3f}{phase['p50']:>10.3f}"
+              f"{phase['p90']:>10.3f}{phase['p99']:>10.3f}", file=file)
+    for name, count in report["counters"].items():
+        print(f"{name:<28}{count:>8}", file=file)
@@ -0,0 +1,312 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+import asyncio
+import http
+import itertools
+import json
+import random
+import sys
+import time
+import traceback
+from .board import LEVELS
+from .batch import verify_Chunk
+from .formats import format_Grid, parse_Line, unpack_Grid
+from .game import GameState
+from .generator import make_Puzzle
+from .instrument import LatencyStats
+from .solver import get_Solver, use_Solver
+
+def start_Worker(solver: str):
+    """Initializes a worker process of the server: selects the solver backend and reseeds `random`."""
+    use_Solver(solver)
+    random.seed()  # forked workers would otherwise all draw the same puzzles
+
+def make_Puzzles(level: str, count: int, seed: int = None) -> list:
+    """
+    Builds `count` puzzles of `level` in a worker process; returns (solution, puzzle) tuples.
+
+    With a `seed`, puzzle i is the one of the seed `seed + i`, so it does not depend on the worker.
+    """
+    return [make_Puzzle(level, seed=None if seed is None else seed + i)[:2] for i in range(count)]
+
+def read_Board(value) -> list:
+    """
+    Reads a board sent by a client: an 81-character line ('.' or '0' for empty cells) or 9 rows.
+
+    Raises:
+        ValueError: If `value` is not a 9x9 board of None or digits from 0 to 9.
+    """
+    if isinstance(value, str):
+        return unpack_Grid(parse_Line(value))
+    if (not isinstance(value, list) or len(value) != 9 or
+            any(not isinstance(row, list) or len(row) != 9 for row in value)):
+        raise ValueError("a board is an 81-character line or a list of 9 rows of 9 cells")
+    if any(n is not None and (type(n) is not int or not 0 <= n <= 9) for row in value for n in row):
+        raise ValueError("the cells of a board are null or digits from 0 to 9")
+    return [[n or None for n in row] for row in value]
+
+class UnknownPuzzle(Exception):
+    """Raised when a request names a puzzle id the server does not keep (answered with a 404)."""
+
+class PuzzleServer:
+    """
+    Local HTTP/JSON puzzle service running on asyncio.
+
+    Puzzle generation and solving run in a process pool, so the event loop only parses requests
+    and answers checks and hints, which take microseconds. Puzzles handed out are kept by id (the
+    least recently used ones are dropped past `capacity`) so that checks and hints need no
+    solution from the client. Connections are kept alive between requests.
+
+    Endpoints:
+        GET /puzzle?level=Easy&count=1&seed=: New puzzles, generated `batch` per worker task; with
+            a seed, puzzle i is the reproducible puzzle of the seed `seed + i` (see `make_Puzzle`).
+        POST /check {"id", "board"}: The wrong cells, conflicts and progress of a board, like `button_Check`.
+        POST /hint {"id", "board", "cell"}: The solution's digit of the cell, or of a random unsolved
+            cell, like `button_Hint`; each puzzle has the hints of its level.
+        POST /solve {"puzzle"} or {"puzzles"}: The solution, solution count and search nodes of puzzles.
+        GET /metrics: The request count and latency percentiles of every endpoint and the number of
+            requests that failed with an internal error.
+
+    Attributes:
+        workers (int): The number of worker processes (defaults to the number of CPUs).
+        batch (int): The number of puzzles generated per worker task.
+        capacity (int): The number of puzzles kept for checks and hints.
+        games (OrderedDict): The (level, solution, puzzle, hints left) of every kept puzzle by id.
+        metrics (dict): A `LatencyStats` per endpoint.
+        failures (int): The number of requests that failed with an internal error (status 500).
+    """
+    ROUTES = {("GET", "/puzzle"): "get_Puzzle", ("POST", "/check"): "post_Check", ("POST", "/hint"): "post_Hint",
+              ("POST", "/solve"): "post_Solve", ("GET", "/metrics"): "get_Metrics"}
+    MAX_COUNT = 1000  # puzzles per /puzzle request
+    MAX_BODY = 1 << 20  # bytes per request body
+
+    def __init__(self, workers: int = None, batch: int = 10, capacity: int = 10000):
+        self.workers = workers
+        self.batch = batch
+        self.capacity = capacity
+        self.games = OrderedDict()
+        self.metrics = {path: LatencyStats() for (method, path) in self.ROUTES}
+        self.failures = 0
+        self.executor = None
+        self.server = None
+        self._connections = {}  # writer -> task serving the connection
+        self._ids = itertools.count(1)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.Server:
+        """Starts the worker processes and listens on `host`:`port` (0 picks a free port)."""
+        self.executor = ProcessPoolExecutor(self.workers, initializer=start_Worker, initargs=(get_Solver()["name"],))
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    async def stop(self):
+        """Stops listening and shuts the worker processes down."""
+        if self.server is not None:
+            self.server.close()
+            tasks = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serves the requests of one connection until the client closes it or asks to."""
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                try:
+                    method, target, version, headers = await self.read_Head(line, reader)
+                    length = int(headers.get("content-length", 0))
+                    if not 0 <= length <= self.MAX_BODY:
+                        raise ValueError(f"Content-Length must be between 0 and {self.MAX_BODY}")
+                except ValueError as error:
+                    # the rest of the stream cannot be framed, so the connection is closed after the answer
+                    await self.respond(writer, 400, {"error": f"malformed request: {error}"}, close=True)
+                    break
+                body = await reader.readexactly(length)
+                status, payload = await self.dispatch(method, target, body)
+                close = headers.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+                await self.respond(writer, status, payload, close)
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def read_Head(self, line: bytes, reader: asyncio.StreamReader) -> tuple:
+        """
+        Parses the request line `line` and reads the headers that follow it.
+
+        Returns:
+            tuple: The method, the target, the HTTP version and the headers (lowercase names).
+
+        Raises:
+            ValueError: If the request line or a header is malformed.
+        """
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+            raise ValueError("the request line must be 'METHOD target HTTP/version'")
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, colon, value = line.decode("latin-1").partition(":")
+            if not colon or not name.strip():
+                raise ValueError(f"bad header line {line.decode('latin-1').strip()!r}")
+            headers[name.strip().lower()] = value.strip()
+        return (*parts, headers)
+
+    async def respond(self, writer: asyncio.StreamWriter, status: int, payload: dict, close: bool = False):
+        """Writes a JSON response, announcing that the connection closes after it when `close` is set."""
+        data = json.dumps(payload).encode()
+        connection = "Connection: close\r\n" if close else ""
+        writer.write(f"HTTP/1.1 {status} {http.HTTPStatus(status).phrase}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n{connection}\r\n".encode() + data)
+        await writer.drain()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> tuple:
+        """
+        Runs the handler of a request and records its latency.
+
+        Returns:
+            tuple: The HTTP status and the JSON payload of the response.
+        """
+        url = urlsplit(target)
+        name = self.ROUTES.get((method, url.path))
+        if name is None:
+            status = 405 if any(path == url.path for (_, path) in self.ROUTES) else 404
+            return status, {"error": f"no route for {method} {url.path}"}
+        start = time.perf_counter()
+        try:
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("the request body must be a JSON object")
+            payload = await getattr(self, name)(query, data)
+            status = 200
+        except UnknownPuzzle as error:
+            status, payload = 404, {"error": str(error)}
+        except (ValueError, TypeError) as error:
+            status, payload = 400, {"error": str(error)}
+        except Exception:
+            # a bug must still answer the client, without leaking its details
+            traceback.print_exc(file=sys.stderr)
+            self.failures += 1
+            status, payload = 500, {"error": "internal server error"}
+        self.metrics[url.path].add(time.perf_counter() - start)
+        return status, payload
+
+    def game(self, body: dict) -> tuple:
+        """Returns the id and the kept [level, solution, puzzle, hints left] of the request's puzzle."""
+        game_id = str(body.get("id"))
+        if game_id not in self.games:
+            raise UnknownPuzzle(f"unknown puzzle {game_id}")
+        game = self.games[game_id]
+        self.games.move_to_end(game_id)
+        return game_id, game
+
+    async def get_Puzzle(self, query: dict, body: dict) -> dict:
+        """Generates `count` puzzles of `level` in the worker processes and keeps them by id."""
+        level = query.get("level", "Easy")
+        count = int(query.get("count", 1))
+        seed = int(query["seed"]) if "seed" in query else None
+        if level not in LEVELS:
+            raise ValueError(f"unknown level {level!r}, expected one of {', '.join(LEVELS)}")
+        if not 1 <= count <= self.MAX_COUNT:
+            raise ValueError(f"count must be between 1 and {self.MAX_COUNT}")
+        loop = asyncio.get_running_loop()
+        tasks = [loop.run_in_executor(self.executor, make_Puzzles, level, min(self.batch, count - start),
+                                      None if seed is None else seed + start)
+                 for start in range(0, count, self.batch)]
+        puzzles = []
+        for chunk in await asyncio.gather(*tasks):
+            for (solution, puzzle) in chunk:
+                extra = {} if seed is None else {"seed": seed + len(puzzles)}
+                game_id = str(next(self._ids))
+                self.games[game_id] = [level, solution, puzzle, LEVELS[level]["hint"]]
+                if len(self.games) > self.capacity:
+                    self.games.popitem(last=False)
+                puzzles.append({"id": game_id, "level": level, "puzzle": format_Grid(puzzle), **extra})
+        return puzzles[0] if count == 1 and "count" not in query else {"puzzles": puzzles}
+
+    async def post_Check(self, query: dict, body: dict) -> dict:
+        """Reports the wrong cells, conflicts, progress and completion of a submitted board."""
+        game_id, (level, solution, puzzle, hints) = self.game(body)
+        board = read_Board(body.get("board", "." * 81))
+        state = GameState(solution, puzzle, [(r, c) for r in range(9) for c in range(9) if puzzle[r][c] is None])
+        for (r, c) in state.blanks:
+            if board[r][c] is not None:
+                state.set(r, c, board[r][c])
+        return {"id": game_id, "wrong": sorted(state.wrong), "conflicts": sorted(state.conflicts),
+                "progress": state.progress(), "complete": state.is_complete()}
+
+    async def post_Hint(self, query: dict, body: dict) -> dict:
+        """Reveals the requested cell, or a random cell the board does not solve yet, using up a hint."""
+        game_id, game = self.game(body)
+        level, solution, puzzle, hints = game
+        if hints <= 0:
+            raise ValueError("no hints left")
+        board = read_Board(body.get("board", "." * 81))
+        unsolved = [(r, c) for r in range(9) for c in range(9)
+                    if puzzle[r][c] is None and board[r][c] != solution[r][c]]
+        if not unsolved:
+            raise ValueError("the board is already solved")
+        cell = tuple(body["cell"]) if body.get("cell") is not None else None
+        r, c = cell if cell in unsolved else random.choice(unsolved)
+        game[3] -= 1
+        return {"id": game_id, "cell": [r, c], "value": solution[r][c], "hints": game[3]}
+
+    async def post_Solve(self, query: dict, body: dict) -> dict:
+        """Solves and counts the solutions of one or more puzzles in the worker processes."""
+        if "puzzle" not in body and "puzzles" not in body:
+            raise ValueError("send a 'puzzle' or a list of 'puzzles'")
+        lines = body["puzzles"] if "puzzles" in body else [body["puzzle"]]
+        if not isinstance(lines, list) or not 1 <= len(lines) <= self.MAX_COUNT:
+            raise ValueError(f"puzzles must be a list of 1 to {self.MAX_COUNT} puzzles")
+        lines = [(line if isinstance(line, str) else format_Grid(read_Board(line))).encode() for line in lines]
+        loop = asyncio.get_running_loop()
+        tasks = [loop.run_in_executor(self.executor, verify_Chunk, lines[start:start + self.batch])
+                 for start in range(0, len(lines), self.batch)]
+        results = [{"puzzle": puzzle, "solution": solution, "count": count, "nodes": nodes}
+                   for chunk in await asyncio.gather(*tasks)
+                   for (puzzle, solution, count, nodes, seconds) in chunk]
+        return results[0] if "puzzles" not in body else {"results": results}
+
+    async def get_Metrics(self, query: dict, body: dict) -> dict:
+        """Returns the number of kept puzzles and of failed requests and the latency summary of every endpoint."""
+        return {"puzzles": len(self.games), "failures": self.failures, **{path: stats.summary() for path, stats in self.metrics.items()}}
+
+async def fetch(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str,
+                payload: dict = None) -> tuple:
+    """
+    Sends one request over an open keep-alive connection and reads the response.
+
+    Returns:
+        tuple: The HTTP status and the decoded JSON payload.
+    """
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+async def serve(host: str = "127.0.0.1", port: int = 8080, workers: int = None):
+    """Runs a `PuzzleServer` until the task is cancelled (Ctrl+C on the command line)."""
+    server = PuzzleServer(workers)
+    listener = await server.start(host, port)
+    print(f"serving on http://{host}:{listener.sockets[0].getsockname()[1]}", file=sys.stderr)
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.stop()
@@ -0,0 +1,444 @@
+import random
+from .board import Board, grid_Box
+from .formats import unpack_Grid
+from .instrument import record_Search, time_Call
+
+Solver = "propagate"  # solver backend of `SOLVERS`: "propagate" or "dlx"
+
+@time_Call()
+def solve(grid: list, solver: str = None) -> tuple:
+    """
+    Solves an arbitrary partially filled Sudoku grid.
+
+    This function loads `grid` into a `Board` and runs the search of the solver backend. The 
+    default `search_Board` applies constraint propagation (naked and hidden singles) and, when
+    it has to guess, branches on the empty cell with the fewest candidates; `search_DLX` runs 
+    Algorithm X on the exact-cover matrix. The input grid is left unchanged.
+
+    Args:
+        grid (list): A 9x9 (or 16x16, 25x25) list representing the Sudoku puzzle (with None for 
+                     empty cells), or an 81-byte board from `parse_Line`.
+        solver (str): The backend of `SOLVERS` to use (defaults to the one selected by `use_Solver`).
+
+    Returns:
+        tuple: The solved grid in the same format as `grid` (None if the puzzle has no solution 
+               or its clues conflict) and a dict with the number of search `nodes` visited and 
+               `backtracks` made.
+    """
+    stats = {"nodes": 0, "backtracks": 0}
+    board = load_Board(grid)
+    if board is None:
+        return None, stats
+    result = get_Solver(solver)["search"](board, stats)
+    record_Search("solve", stats)
+    if result is None:
+        return None, stats
+    return (result.to_bytes() if isinstance(grid, (bytes, bytearray)) else result.to_list()), stats
+
+@time_Call()
+def count_Solutions(grid: list, limit: int = 2, solver: str = None) -> int:
+    """
+    Counts the solutions of a Sudoku grid, stopping as soon as `limit` solutions are found.
+
+    With the default `limit` of 2 this is a cheap uniqueness test: the search ends at the second
+    solution instead of enumerating all of them.
+
+    Args:
+        grid (list): A 9x9 list representing the Sudoku puzzle (with None for empty cells), or 
+                     an 81-byte board from `parse_Line`.
+        limit (int): The number of solutions after which counting stops.
+        solver (str): The backend of `SOLVERS` to use (defaults to the one selected by `use_Solver`).
+
+    Returns:
+        int: The number of solutions found, at most `limit`.
+    """
+    board = load_Board(grid)
+    if board is None:
+        return 0
+    return get_Solver(solver)["count"](board, limit)
+
+def load_Board(grid: list) -> Board:
+    """
+    Loads a list of rows or a byte board into a `Board`, checking that the given clues do not conflict.
+
+    Args:
+        grid (list): A 9x9 (or 16x16, 25x25) list representing the Sudoku puzzle (with None for 
+                     empty cells), or a byte board from `parse_Line`.
+
+    Returns:
+        Board: The loaded board, or None if two clues share a row, column or box.
+    """
+    if isinstance(grid, (bytes, bytearray)):
+        grid = unpack_Grid(grid)
+    board = Board(box=grid_Box(grid))
+    for row in range(board.size):
+        for col in range(board.size):
+            n = grid[row][col]
+            if n is not None:
+                if not board.can_place(n, row, col):
+                    return None
+                board.set(row, col, n)
+    return board
+
+def propagate_Board(board: Board) -> bool:
+    """
+    Fills every naked and hidden single of a `Board` until no more can be found.
+
+    A naked single is an empty cell with one candidate left; a hidden single is a digit that 
+    fits only one cell of a row, column or box. Both are placed on `board` in place.
+
+    Args:
+        board (Board): The board to propagate.
+
+    Returns:
+        bool: False if a contradiction was found (a cell or a digit with no place left), True otherwise.
+    """
+    cells = board.cells
+    size = board.size
+    changed = True
+    while changed:
+        changed = False
+        for row in range(size):
+            for col in range(size):
+                if cells[row][col] is None:
+                    mask = board.candidates(row, col)
+                    if not mask:
+                        return False
+                    if not mask & (mask - 1):
+                        board.set(row, col, mask.bit_length() - 1)
+                        changed = True
+        for unit in board.units:
+            placed = seen = twice = 0
+            for (row, col) in unit:
+                if cells[row][col] is None:
+                    mask = board.candidates(row, col)
+                    twice |= seen & mask
+                    seen |= mask
+                else:
+                    placed |= 1 << cells[row][col]
+            if seen | placed != board.full:
+                return False
+            once = seen & ~twice
+            while once:
+                bit = once & -once
+                once ^= bit
+                for (row, col) in unit:
+                    if cells[row][col] is None and board.candidates(row, col) & bit:
+                        board.set(row, col, bit.bit_length() - 1)
+                        changed = True
+                        break
+    return True
+
+def search_Board(board: Board, stats: dict, randomize: bool = False, rng: random.Random = None) -> Board:
+    """
+    Searches for a solution of a `Board` with propagation and minimum-remaining-values branching.
+
+    Args:
+        board (Board): The board to solve. It is modified in place by propagation.
+        stats (dict): The `nodes` and `backtracks` counters, updated during the search.
+        randomize (bool): Whether to try the candidates of a cell in random order (for generation).
+        rng (random.Random): The generator drawing that order (defaults to the global `random` module).
+
+    Returns:
+        Board: A solved board, or None if `board` has no solution.
+    """
+    stats["nodes"] += 1
+    if not propagate_Board(board):
+        return None
+    best = select_Cell(board)
+    if best is None:
+        return board
+    row, col = best
+    mask = board.candidates(row, col)
+    nums = [n for n in range(1, board.size + 1) if mask >> n & 1]
+    if randomize:
+        (rng or random).shuffle(nums)
+    for n in nums:
+        child = board.copy()
+        child.set(row, col, n)
+        result = search_Board(child, stats, randomize, rng)
+        if result:
+            return result
+        stats["backtracks"] += 1
+    return None
+
+def count_Board(board: Board, limit: int, stats: dict = None, found: list = None) -> int:
+    """
+    Counts the solutions of a `Board` up to `limit`, using the same search as `search_Board`.
+
+    Args:
+        board (Board): The board to count. It is modified in place by propagation.
+        limit (int): The number of solutions after which counting stops.
+        stats (dict): Optional `nodes` counter, updated during the search.
+        found (list): Optional list receiving every solved `Board` found.
+
+    Returns:
+        int: The number of solutions found, at most `limit`.
+    """
+    if stats is not None:
+        stats["nodes"] += 1
+    if not propagate_Board(board):
+        return 0
+    best = select_Cell(board)
+    if best is None:
+        if found is not None:
+            found.append(board)
+        return 1
+    row, col = best
+    mask = board.candidates(row, col)
+    total = 0
+    for n in range(1, board.size + 1):
+        if mask >> n & 1:
+            child = board.copy()
+            child.set(row, col, n)
+            total += count_Board(child, limit - total, stats, found)
+            if total >= limit:
+                break
+    return total
+
+def select_Cell(board: Board) -> tuple:
+    """
+    Picks the empty cell of a `Board` with the fewest candidates (minimum remaining values).
+
+    Args:
+        board (Board): The board to inspect.
+
+    Returns:
+        tuple: The (row, col) of the chosen cell, or None if the board is full.
+    """
+    best, best_count = None, board.size + 1
+    for row in range(board.size):
+        for col in range(board.size):
+            if board.cells[row][col] is None:
+                count = board.candidates(row, col).bit_count()
+                if count < best_count:
+                    best, best_count = (row, col), count
+                    if count == 2:
+                        return best
+    return best
+
+class DancingLinks:
+    """
+    Exact-cover matrix of a Sudoku board searched with Knuth's Algorithm X and dancing links.
+
+    Every (cell, digit) candidate is a matrix row covering four columns: the cell itself and 
+    the digit in its row, column and box. Instead of one object per node, the nodes live in a 
+    pool of flat integer lists indexed by node number: node 0 is the root, nodes 1 to 4*size*size
+    are the column headers and the four nodes of candidate `i` start at `4*i + 4*size*size + 1`.
+    The empty matrix of each board size is built once and copied for every search.
+
+    Attributes:
+        size (int): The side of the grid.
+        left, right, up, down (list): The links of every node.
+        column (list): The column header of every node.
+        row (list): The candidate (cell * size + digit - 1) of every node, -1 for headers.
+        count (list): The number of rows left in every column.
+        chosen (list): The candidates selected on the current search path.
+    """
+    __slots__ = ("size", "left", "right", "up", "down", "column", "row", "count", "chosen")
+    TEMPLATES = {}
+
+    def __init__(self, board: Board):
+        if board.box not in self.TEMPLATES:
+            self.TEMPLATES[board.box] = self.build(board.box)
+        self.size = board.size
+        self.left, self.right, self.up, self.down, self.column, self.row, self.count = (
+            list(links) for links in self.TEMPLATES[board.box])
+        self.chosen = []
+        first = 4 * self.size * self.size + 1
+        for row in range(self.size):
+            for col in range(self.size):
+                n = board.cells[row][col]
+                if n is not None:
+                    node = first + 4 * ((row * self.size + col) * self.size + n - 1)
+                    for j in range(node, node + 4):
+                        self.cover(self.column[j])
+
+    @staticmethod
+    def build(box: int) -> tuple:
+        """Returns the node lists of the empty exact-cover matrix of a `box`x`box` board."""
+        size = box * box
+        columns = 4 * size * size
+        left = [columns] + list(range(columns))
+        right = list(range(1, columns + 1)) + [0]
+        up, down, column = list(range(columns + 1)), list(range(columns + 1)), list(range(columns + 1))
+        row, count = [-1] * (columns + 1), [0] * (columns + 1)
+        for r in range(size):
+            for c in range(size):
+                b = (r // box) * box + c // box
+                for d in range(size):
+                    first = len(left)
+                    heads = (1 + r*size + c, 1 + size*size + r*size + d,
+                             1 + 2*size*size + c*size + d, 1 + 3*size*size + b*size + d)
+                    for k, head in enumerate(heads):
+                        node = first + k
+                        left.append(first + (k - 1) % 4)
+                        right.append(first + (k + 1) % 4)
+                        up.append(up[head])
+                        down.append(head)
+                        down[up[head]] = node
+                        up[head] = node
+                        column.append(head)
+                        row.append((r*size + c)*size + d)
+                        count[head] += 1
+        return left, right, up, down, column, row, count
+
+    def cover(self, c: int):
+        """Removes column `c` and every row that has a node in it."""
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+        right[left[c]], left[right[c]] = right[c], left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]], up[down[j]] = down[j], up[j]
+                count[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, c: int):
+        """Restores column `c` and its rows, undoing `cover`."""
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                count[column[j]] += 1
+                down[up[j]] = up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = left[right[c]] = c
+
+    def search(self, limit: int, stats: dict, found: list, randomize: bool = False, rng: random.Random = None) -> int:
+        """
+        Runs Algorithm X, always branching on the column with the fewest rows left.
+
+        Args:
+            limit (int): The number of solutions after which the search stops.
+            stats (dict): The `nodes` and `backtracks` counters, updated during the search.
+            found (list): The list receiving the chosen candidates of every solution found.
+            randomize (bool): Whether to try the rows of a column in random order (for generation).
+            rng (random.Random): The generator drawing that order (defaults to the global `random` module).
+
+        Returns:
+            int: The number of solutions found, at most `limit`.
+        """
+        stats["nodes"] += 1
+        right, left, down, count, column = self.right, self.left, self.down, self.count, self.column
+        if right[0] == 0:
+            found.append(self.chosen[:])
+            return 1
+        best, best_count = 0, self.size + 1
+        c = right[0]
+        while c:
+            if count[c] < best_count:
+                best, best_count = c, count[c]
+                if best_count < 2:
+                    break
+            c = right[c]
+        if best_count == 0:
+            return 0
+        self.cover(best)
+        rows = []
+        i = down[best]
+        while i != best:
+            rows.append(i)
+            i = down[i]
+        if randomize:
+            (rng or random).shuffle(rows)
+        total = 0
+        for i in rows:
+            self.chosen.append(self.row[i])
+            j = right[i]
+            while j != i:
+                self.cover(column[j])
+                j = right[j]
+            solutions = self.search(limit - total, stats, found, randomize, rng)
+            j = left[i]
+            while j != i:
+                self.uncover(column[j])
+                j = left[j]
+            self.chosen.pop()
+            if not solutions:
+                stats["backtracks"] += 1
+            total += solutions
+            if total >= limit:
+                break
+        self.uncover(best)
+        return total
+
+    def solution(self, board: Board, chosen: list) -> Board:
+        """Returns a copy of `board` with the chosen candidates of a solution placed."""
+        result = board.copy()
+        for candidate in chosen:
+            cell, d = divmod(candidate, self.size)
+            result.set(cell // self.size, cell % self.size, d + 1)
+        return result
+
+def search_DLX(board: Board, stats: dict, randomize: bool = False, rng: random.Random = None) -> Board:
+    """
+    Searches for a solution of a `Board` with `DancingLinks`, like `search_Board`.
+
+    Args:
+        board (Board): The board to solve. It is left unchanged.
+        stats (dict): The `nodes` and `backtracks` counters, updated during the search.
+        randomize (bool): Whether to try the candidates in random order (for generation).
+        rng (random.Random): The generator drawing that order (defaults to the global `random` module).
+
+    Returns:
+        Board: A solved board, or None if `board` has no solution.
+    """
+    links = DancingLinks(board)
+    found = []
+    links.search(1, stats, found, randomize, rng)
+    return links.solution(board, found[0]) if found else None
+
+def count_DLX(board: Board, limit: int, stats: dict = None, found: list = None) -> int:
+    """
+    Counts the solutions of a `Board` up to `limit` with `DancingLinks`, like `count_Board`.
+
+    Args:
+        board (Board): The board to count. It is left unchanged.
+        limit (int): The number of solutions after which counting stops.
+        stats (dict): Optional `nodes` counter, updated during the search.
+        found (list): Optional list receiving every solved `Board` found.
+
+    Returns:
+        int: The number of solutions found, at most `limit`.
+    """
+    links = DancingLinks(board)
+    run, solutions = {"nodes": 0, "backtracks": 0}, []
+    total = links.search(limit, run, solutions)
+    if stats is not None:
+        stats["nodes"] += run["nodes"]
+    if found is not None:
+        found.extend(links.solution(board, chosen) for chosen in solutions)
+    return total
+
+# Solver backends: "search" finds one solution like `search_Board`, "count" counts like `count_Board`.
+SOLVERS = {
+    "propagate": {"name": "propagate", "search": search_Board, "count": count_Board},
+    "dlx": {"name": "dlx", "search": search_DLX, "count": count_DLX},
+}
+
+def get_Solver(name: str = None) -> dict:
+    """Returns the backend of `SOLVERS` called `name`, or the one selected by `use_Solver`."""
+    return SOLVERS[name or Solver]
+
+def use_Solver(name: str):
+    """
+    Selects the solver backend used when no `solver` argument is given.
+
+    Also used as the initializer of the worker processes, so the batch commands run with the
+    backend chosen in the parent process.
+
+    Args:
+        name (str): A key of `SOLVERS`.
+
+    Raises:
+        ValueError: If `name` is not a known backend.
+    """
+    global Solver
+    if name not in SOLVERS:
+        raise ValueError(f"unknown solver {name!r}, expected one of {', '.join(SOLVERS)}")
+    Solver = name
@@ -0,0 +1,153 @@
+import itertools
+import random
+from .board import grid_Box
+from .formats import pack_Grid
+
+LINE_ORDERS = {}
+
+def line_Orders(box: int) -> list:
+    """
+    Returns every order of the rows (or columns) of a board that keeps its bands (or stacks) together.
+
+    There are (box!)^(box+1) of them, 1296 for 9x9, so the list is built once per box size and
+    only used for 9x9 boards.
+
+    Args:
+        box (int): The side of a box in cells.
+
+    Returns:
+        list: Tuples of old line indexes, one per new line position.
+    """
+    if box not in LINE_ORDERS:
+        inner = list(itertools.permutations(range(box)))
+        LINE_ORDERS[box] = [tuple(band * box + line for band in bands for line in lines[band])
+                            for bands in inner for lines in itertools.product(inner, repeat=box)]
+    return LINE_ORDERS[box]
+
+def random_Transform(box: int = 3, rng: random.Random = None) -> tuple:
+    """
+    Draws a random validity-preserving transform of a board.
+
+    Args:
+        box (int): The side of a box in cells (3 for 9x9, 4 for 16x16, 5 for 25x25).
+        rng (random.Random): The generator drawing the transform (defaults to the global `random` module).
+
+    Returns:
+        tuple: Whether to transpose, the new order of the rows and of the columns (old indexes,
+               bands and stacks kept together) and the new digit of every digit (index 0 unused).
+    """
+    rng = rng or random
+    lines = []
+    for _ in range(2):
+        bands = rng.sample(range(box), box)
+        lines.append([band * box + line for band in bands for line in rng.sample(range(box), box)])
+    digits = [0] + rng.sample(range(1, box * box + 1), box * box)
+    return rng.random() < 0.5, lines[0], lines[1], digits
+
+def transform_Grid(data: list, transform: tuple) -> list:
+    """
+    Applies a transform of `random_Transform` to a grid.
+
+    Transposing maps a valid grid to a valid grid, and so do relabeling the digits, reordering
+    the rows within a band (columns within a stack) and reordering the bands (stacks), so the
+    result is a valid grid with as many solutions as `data`.
+
+    Args:
+        data (list): A size x size grid (with None for empty cells). It is not modified.
+        transform (tuple): The (transpose, rows, cols, digits) transform.
+
+    Returns:
+        list: The transformed grid.
+    """
+    transpose, rows, cols, digits = transform
+    if transpose:
+        data = [list(col) for col in zip(*data)]
+    return [[digits[data[r][c]] if data[r][c] is not None else None for c in cols] for r in rows]
+
+def transform_Puzzle(solution: list, puzzle: list, rng: random.Random = None) -> tuple:
+    """
+    Builds a new-looking puzzle from a vetted one by applying the same random transform to both grids.
+
+    The result has the same clue count, a unique solution and the same graded difficulty as
+    `puzzle`, at the cost of copying two grids instead of generating and grading a new one.
+
+    Args:
+        solution (list): The solved grid of the vetted puzzle.
+        puzzle (list): The vetted puzzle grid (with None for empty cells).
+        rng (random.Random): The generator drawing the transform (defaults to the global `random` module).
+
+    Returns:
+        tuple: The solved grid, the puzzle grid and the sorted list of blank (row, col) cells, like `make_Puzzle`.
+    """
+    transform = random_Transform(grid_Box(puzzle), rng)
+    data, puzzle = transform_Grid(solution, transform), transform_Grid(puzzle, transform)
+    size = len(puzzle)
+    return data, puzzle, [(r, c) for r in range(size) for c in range(size) if puzzle[r][c] is None]
+
+def canonical_Key(grid) -> bytes:
+    """
+    Returns the minimal form of a 9x9 grid under the transforms of `random_Transform`.
+
+    Two grids get the same key exactly when one is a transform of the other, so the key can
+    index a set of puzzles to drop equivalent ones. The key is the lexicographically smallest
+    81-byte board (0 for empty cells) over the transposes, the row and column orders of
+    `line_Orders` and the digit relabelings, whose digits are numbered in order of first
+    appearance. Rather than trying the 3.4 million row and column orders, the board is built
+    row by row, keeping only the partial orders that tie for the smallest prefix.
+
+    Args:
+        grid: A 9x9 list (with None for empty cells) or an 81-byte board from `parse_Line`.
+
+    Returns:
+        bytes: The 81-byte canonical board.
+
+    Raises:
+        ValueError: If `grid` is not a 9x9 grid.
+    """
+    raw = bytes(grid) if isinstance(grid, (bytes, bytearray)) else pack_Grid(grid)
+    if len(raw) != 81:
+        raise ValueError("canonical keys are only computed for 9x9 grids")
+    variants = [[raw[r*9:r*9 + 9] for r in range(9)],
+                [bytes(raw[r*9 + c] for r in range(9)) for c in range(9)]]
+    # a state is (rows of the variant, rows used so far, column order, digit labels so far)
+    first = {(rows, r): first_Orders(rows[r]) for rows in map(tuple, variants) for r in range(9)}
+    best = min(text for text, orders in first.values())
+    states = [(rows, (r,), cols, {rows[r][c]: i + 1 for i, c in enumerate(c for c in cols if rows[r][c])})
+              for (rows, r), (text, orders) in first.items() if text == best for cols in orders]
+    key = best
+    for index in range(1, 9):
+        best, ties = None, []
+        for rows, used, cols, labels in states:
+            if index % 3:
+                band = used[-1] // 3 * 3
+                choices = [r for r in range(band, band + 3) if r not in used]
+            else:
+                choices = [r for r in range(9) if r // 3 * 3 not in [u // 3 * 3 for u in used]]
+            for r in choices:
+                line, new = rows[r], dict(labels)
+                text = bytes(new.setdefault(line[c], len(new) + 1) if line[c] else 0 for c in cols)
+                if best is None or text < best:
+                    best, ties = text, []
+                if text == best:
+                    ties.append((rows, used + (r,), cols, new))
+        key += best
+        states = ties
+    return key
+
+def first_Orders(line: bytes) -> tuple:
+    """
+    Returns the smallest first row of `canonical_Key` made of `line`, and every column order giving it.
+
+    The digits of a first row are always labeled 1, 2, 3... from the left, so only the empty cells
+    matter: they come first in each stack, and the stacks with the most empty cells come first.
+    """
+    stacks = [[c for c in range(s, s + 3) if not line[c]] for s in range(0, 9, 3)]
+    inner = [[zeros + rest for zeros in itertools.permutations(stacks[s])
+              for rest in itertools.permutations([c for c in range(s * 3, s * 3 + 3) if line[c]])]
+             for s in range(3)]
+    orders = [tuple(itertools.chain(*parts))
+              for stack_order in itertools.permutations(range(3))
+              if all(len(stacks[a]) >= len(stacks[b]) for a, b in zip(stack_order, stack_order[1:]))
+              for parts in itertools.product(*(inner[s] for s in stack_order))]
+    labels = itertools.count(1)
+    return bytes(next(labels) if line[c] else 0 for c in orders[0]), orders
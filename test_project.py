@@ -1,11 +1,24 @@
+import pytest
+pytest.importorskip("tkinter")
 from tkinter import *
-from unittest.mock import patch
-from project import validation, generate_Sudoku
-from project import select_Level, start_Game
+from unittest.mock import Mock, patch
+from project import solve
+from project import GameState, Highlighter, CanvasBoard
+from project import select_Level, start_Game, resume_Game, GUI, make_Puzzle
+from project import read_Sessions, write_Sessions
+
+@pytest.fixture(scope="module")
+def frame():
+    """A frame in a Tk window created on first use, so the file is collected without a display."""
+    try:
+        root = Tk()
+    except TclError:
+        pytest.skip("Tk needs a display")
+    frame = Frame(root)
+    frame.pack()
+    yield frame
+    root.destroy()
 
-root = Tk()
-frame = Frame(root)
-frame.pack()
 data = [
     [5, 3, None, None, 7, None, None, None, None],
     [6, None, None, 1, 9, 5, None, None, None],
@@ -18,33 +31,55 @@ data = [
     [None, None, None, None, 8, None, None, 7, 9],
 ]
 
-def test_validation():
-    assert validation(data,5,0,2) == False
-    assert validation(data,1,0,2) == True
+def test_Highlighter(frame):
+    cells = [[Label(frame, text="", bg="white", fg="black") for _ in range(9)] for _ in range(9)]
+    base = [[("white", "black", "normal") for _ in range(9)] for _ in range(9)]
+    location = [(r,c) for r in range(9) for c in range(9) if data[r][c] is None]
+    highlight = Highlighter(cells, base, GameState(solve(data)[0], data, location))
+    calls = []
 
-def test_generate_Sudoku():
-    data = [[None]*9 for _ in range(9)]
-    data_bool = generate_Sudoku(data)
-    assert data_bool == True
+    highlight.begin()
+    highlight.select((0,0))
+    calls.append(highlight.last_calls)
+    assert highlight.last_calls == 21 + 2  # row, column and box, plus the two other 5s
+    assert cells[0][0].cget("fg") == "magenta" and cells[8][0].cget("bg") == "lightblue"
+    highlight.begin()
+    highlight.select((0,1))
+    calls.append(highlight.last_calls)
+    assert highlight.last_calls < 23
+    highlight.begin()
+    highlight.select((0,1))
+    assert highlight.last_calls == 0
+    highlight.mark(8, 8, "lightpink", "red")
+    highlight.mark(8, 7, "lightpink", "red")
+    calls.append(highlight.last_calls)
+    assert highlight.last_calls == 2  # one interaction counts all of its marks
+    assert cells[8][8].cget("bg") == "lightpink"
+    highlight.begin()
+    highlight.select(None)
+    calls.append(highlight.last_calls)
+    assert all(cells[r][c].cget("bg") == "white" for r in range(9) for c in range(9))
+    assert highlight.tk_calls == sum(calls)
 
-    for row in data:
-        for cell in row:
-            assert 1 <= cell <= 9
-        assert sorted(row) == list(range(1,10))
+def test_CanvasBoard(frame):
+    board = CanvasBoard(frame)
+    location = [(r,c) for r in range(9) for c in range(9) if data[r][c] is None]
+    board.load(data, location)
+    assert board.cells[0][0].get() == "5" and not board.cells[0][0].editable
+    assert board.cells[0][2].get() == "" and board.cells[0][2].editable
+    assert board.canvas.itemcget(board.cells[0][0].text, "text") == "5"
+    board.cells[0][2].insert(END, "4")
+    board.cells[0][2].config(bg="lightblue")
+    assert board.canvas.itemcget(board.cells[0][2].rect, "fill") == "lightblue"
+    assert board.cell_at(CanvasBoard.SIZE * 2 + 1, 1) == (0, 2)
+    assert board.cell_at(-1, 1) is None
 
-    for col in range(9):
-        column = [data[row][col] for row in range(9)]
-        assert sorted(column) == list(range(1,10))
-    
-    for sub_row in range(0,9,3):
-        for sub_col in range(0,9,3):
-            sub_grid = []
-            for row in range(sub_row, sub_row + 3):
-                for col in range(sub_col, sub_col + 3):
-                    sub_grid.append(data[row][col])
-            assert sorted(sub_grid) == list(range(1,10))
+    items = board.canvas.find_all()
+    board.load(data, location)
+    assert board.canvas.find_all() == items
+    assert board.cells[0][2].get() == ""
 
-def test_select_Level():
+def test_select_Level(frame):
     mock_start_game = patch('project.start_Game').start()
     
     select_Level(frame)
@@ -65,9 +100,31 @@ def test_select_Level():
     mock_start_game.assert_called_once_with("Expert")
     patch.stopall()
 
-def test_start_Game():
+def test_GUI_board_size(frame):
+    window = Toplevel(frame)
+    patch('project.root', window, create=True).start()
+    patch('project.Renderer', "canvas").start()
+    patch('project.Board_canvas', None).start()
+    patch('project.hint', 3, create=True).start()
+    patch('project.Game_state', None).start()
+    import project
+    for box in (3, 4, 3):
+        solution, puzzle, location = make_Puzzle("Easy", box=box, seed=1)
+        project.location = set(location)
+        project.Game_state = GameState(solution, puzzle, location)
+        GUI(puzzle)
+        assert len(project.Button_nums) == box * box
+        assert project.Board_canvas.box == box and len(project.Frame_grid.winfo_children()) == 1
+    window.destroy()
+    patch.stopall()
+
+def test_start_Game(tmp_path):
     mock_gui = patch('project.GUI').start()
+    patch('project.Label_level', create=True).start()
+    patch('project.SESSION_FILE', str(tmp_path / "sessions")).start()
+    write_Sessions(str(tmp_path / "sessions"), {"last": b"old game", "kept": b"other game"})
     start_Game("Easy")
+    assert read_Sessions(str(tmp_path / "sessions")) == {"kept": b"other game"}
     mock_gui.assert_called_once()
     called_args = list(mock_gui.call_args[0])
     assert len(called_args[0]) == 9
@@ -76,3 +133,33 @@ def test_start_Game():
     count = sum(1 for row in called_args[0] for cell in row if cell is None)
     assert count in range(levels["Easy"], levels["Easy"] + 5,2)
     patch.stopall()
+
+def test_start_Game_polls(tmp_path):
+    puzzle = make_Puzzle("Easy", seed=1)
+    pool = Mock(box=3)
+    pool.get.side_effect = [None, puzzle]
+    patch('project.Puzzle_pool', pool).start()
+    root = patch('project.root', create=True).start()
+    label = patch('project.Label_level', create=True).start()
+    mock_gui = patch('project.GUI').start()
+    patch('project.SESSION_FILE', str(tmp_path / "sessions")).start()
+    start_Game("Easy")
+    pool.get.assert_called_once_with("Easy", wait=False)
+    label.config.assert_called_with(text="generating…")
+    mock_gui.assert_not_called()
+    callback, level = root.after.call_args[0][1:]
+    callback(level)
+    mock_gui.assert_called_once_with(puzzle[1])
+    patch.stopall()
+
+def test_resume_Game():
+    with patch('project.read_Sessions', return_value={"last": b"SDKS" + bytes(16)}), \
+         patch('project.messagebox.showerror') as mock_error, patch('project.GUI') as mock_gui:
+        resume_Game()
+    mock_error.assert_called_once()
+    mock_gui.assert_not_called()
+    with patch('project.read_Sessions', side_effect=ValueError("truncated session store")), \
+         patch('project.messagebox.showerror') as mock_error, patch('project.GUI') as mock_gui:
+        resume_Game()
+    mock_error.assert_called_once()
+    mock_gui.assert_not_called()
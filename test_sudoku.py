@@ -0,0 +1,538 @@
+from sudoku import validation, generate_Sudoku, Board, solve
+from sudoku import count_Solutions, remove_Clues, PuzzlePool
+from sudoku import generate_Batch
+from sudoku import parse_Line, format_Line, format_Grid, pack_Grid, unpack_Grid, pack_Nibbles, unpack_Nibbles
+from sudoku import read_Puzzles, write_Puzzles, verify_Batch, validate_Boards, compare_Boards
+from sudoku import grade_Puzzle, make_Puzzle, load_Puzzle, GameState, find_Deduction
+from sudoku import transform_Puzzle, canonical_Key, line_Orders
+from sudoku import start_Profile, stop_Profile, report_Profile, command_Line
+from sudoku import geometry, DancingLinks, SOLVERS, use_Solver, has_Single
+from sudoku import save_Session, load_Session, write_Sessions, read_Sessions
+from sudoku.server import PuzzleServer, fetch
+import asyncio
+import io
+import pstats
+import random
+import pytest
+import subprocess
+import sys
+import time
+
+data = [
+    [5, 3, None, None, 7, None, None, None, None],
+    [6, None, None, 1, 9, 5, None, None, None],
+    [None, 9, 8, None, None, None, None, 6, None],
+    [8, None, None, None, 6, None, None, None, 3],
+    [4, None, None, 8, None, 3, None, None, 1],
+    [7, None, None, None, 2, None, None, None, 6],
+    [None, 6, None, None, None, None, 2, 8, None],
+    [None, None, None, 4, 1, 9, None, None, 5],
+    [None, None, None, None, 8, None, None, 7, 9],
+]
+
+def test_import():
+    code = "import sys, sudoku; print('tkinter' in sys.modules, 'numpy' in sys.modules, 'argparse' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "False", "False"]
+    namespace = {}
+    exec("from sudoku import *", namespace)
+    assert "UNITS" not in namespace and "step_X_Wing" not in namespace and callable(namespace["command_Line"])
+
+def test_validation():
+    assert validation(data,5,0,2) == False
+    assert validation(data,1,0,2) == True
+
+def test_generate_Sudoku():
+    data = [[None]*9 for _ in range(9)]
+    data_bool = generate_Sudoku(data)
+    assert data_bool == True
+
+    for row in data:
+        for cell in row:
+            assert 1 <= cell <= 9
+        assert sorted(row) == list(range(1,10))
+
+    for col in range(9):
+        column = [data[row][col] for row in range(9)]
+        assert sorted(column) == list(range(1,10))
+    
+    for sub_row in range(0,9,3):
+        for sub_col in range(0,9,3):
+            sub_grid = []
+            for row in range(sub_row, sub_row + 3):
+                for col in range(sub_col, sub_col + 3):
+                    sub_grid.append(data[row][col])
+            assert sorted(sub_grid) == list(range(1,10))
+
+def test_Board():
+    board = Board(data)
+    assert board.can_place(5,0,2) == False
+    assert board.can_place(1,0,2) == True
+    board.set(0,2,1)
+    assert board.can_place(1,0,6) == False
+    assert board.can_place(1,8,2) == False
+    board.clear(0,2)
+    assert board.can_place(1,0,6) == True
+    assert board.to_list() == data
+
+def test_geometry():
+    for box in (3, 4, 5):
+        shape, size = geometry(box), box * box
+        peers = shape["peers"][size - 1][1]
+        assert len(peers) == 3 * size - 2 * box - 1 and (size - 1, 1) not in peers
+        assert set(peers) == {cell for unit in shape["unit_of"][size - 1][1] for cell in shape["units"][unit]} - {(size - 1, 1)}
+    assert geometry(3)["unit_of"][4][7] == (4, 16, 23)
+    assert validation(data, 5, 0, 0) is False  # the cell itself already holds 5
+    assert has_Single(data, 4, 4) and not has_Single(data, 0, 2)
+    puzzle = [row[:] for row in solve(data)[0]]
+    puzzle[2][3] = None
+    assert has_Single(puzzle, 2, 3)
+
+def test_solve():
+    solution, stats = solve(data)
+    assert solution[0] == [5, 3, 4, 6, 7, 8, 9, 1, 2]
+    assert all(data[r][c] in (None, solution[r][c]) for r in range(9) for c in range(9))
+    board = Board(solution)
+    assert all(mask == 0b1111111110 for mask in board.rows + board.cols + board.boxes)
+    assert stats["nodes"] >= 1
+
+    hard = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+    solution, stats = solve([[None if ch == "." else int(ch) for ch in hard[r*9:r*9+9]] for r in range(9)])
+    assert solution is not None and stats["backtracks"] > 0
+
+    conflict = [row[:] for row in data]
+    conflict[0][2] = 5
+    assert solve(conflict)[0] is None
+
+def test_count_Solutions():
+    assert count_Solutions(data) == 1
+    assert count_Solutions([[None]*9 for _ in range(9)]) == 2
+    assert count_Solutions([[None]*9 for _ in range(9)], limit=5) == 5
+
+def test_DancingLinks():
+    solution = solve(data)[0]
+    assert solve(data, solver="dlx")[0] == solution
+    assert count_Solutions(data, solver="dlx") == 1
+    assert count_Solutions([[None]*9 for _ in range(9)], limit=5, solver="dlx") == 5
+    conflict = [row[:] for row in data]
+    conflict[0][2] = 5
+    assert solve(conflict, solver="dlx")[0] is None
+    links = DancingLinks(Board(data))
+    assert len(links.left) == 1 + 4*81 + 4*729 and links.right[0] != 0
+    grid = [[None]*9 for _ in range(9)]
+    assert generate_Sudoku(grid, solver="dlx")
+    assert all(mask == 0b1111111110 for mask in Board(grid).rows)
+    assert set(SOLVERS) == {"propagate", "dlx"}
+    with pytest.raises(ValueError):
+        use_Solver("brute")
+
+def test_large_boards():
+    assert geometry(4)["size"] == 16 and len(geometry(5)["units"]) == 75
+    for box in (4, 5):
+        size = box * box
+        grid = [[None]*size for _ in range(size)]
+        generate_Sudoku(grid)
+        board = Board(grid)
+        assert board.size == size and all(mask == board.full for mask in board.rows + board.cols + board.boxes)
+    solution, puzzle, location = make_Puzzle("Easy", box=4)
+    assert len(location) >= 60 and count_Solutions(puzzle) == 1
+    assert solve(puzzle)[0] == solution
+    assert validation(solution, solution[0][0], 0, 1) is False
+    state = GameState(solution, puzzle, location)
+    assert state.size == 16 and len(state.counts) == 17
+
+def test_remove_Clues():
+    solution = [[None]*9 for _ in range(9)]
+    generate_Sudoku(solution)
+    puzzle, location = remove_Clues(solution, 41)
+    assert len(location) == 41
+    assert all(puzzle[r][c] is None for (r,c) in location)
+    assert count_Solutions(puzzle) == 1
+    assert solve(puzzle)[0] == solution
+    puzzle, location = remove_Clues(solution, 51, max_attempts=10)
+    assert len(location) <= 10
+
+def test_PuzzlePool():
+    pool = PuzzlePool(depth=1)
+    solution, puzzle, location = pool.get("Easy")
+    assert (pool.hits, pool.misses) == (0, 1)
+    assert len(location) in range(21, 26, 2)
+    assert all(puzzle[r][c] is None for (r,c) in location)
+
+    pool.start()
+    deadline = time.time() + 10
+    while len(pool.puzzles["Expert"]) < 1 and time.time() < deadline:
+        time.sleep(0.01)
+    pool.get("Expert")
+    pool.stop()
+    assert (pool.hits, pool.misses) == (1, 1)
+    assert len(pool.keys) == sum(len(bases) for bases in pool.bases.values())
+
+    pool.puzzles["Easy"].clear()
+    variant = pool.get("Easy")  # transformed from a puzzle already built, not generated again
+    assert pool.misses == 2 and canonical_Key(variant[1]) in pool.keys
+    assert not pool.add("Easy", variant) and pool.duplicates == 1
+
+    pool = PuzzlePool(depth=1, seed=2)
+    pool.start()
+    deadline = time.time() + 10
+    while (puzzle := pool.get("Expert", wait=False)) is None and time.time() < deadline:
+        time.sleep(0.01)  # built by the refill thread, never on the calling thread
+    pool.stop(wait=False)
+    assert puzzle is not None and pool.misses == 1  # polled while queued: one miss
+
+    pool = PuzzlePool(depth=1, box=4)
+    solution, puzzle, location = pool.get("Hard")
+    assert len(puzzle) == 16 and len(location) in range(130, 135, 2)
+    variant = pool.get("Hard")
+    assert pool.misses == 2 and len(variant[2]) == len(location) and count_Solutions(variant[1]) == 1
+
+def test_generate_Batch():
+    first, second = io.StringIO(), io.StringIO()
+    assert generate_Batch("Medium", 5, first, workers=2, seed=3, chunk=2) == 5
+    generate_Batch("Medium", 5, second, workers=1, seed=3, chunk=2)
+    third = io.StringIO()
+    generate_Batch("Medium", 5, third, workers=2, seed=3, chunk=3)
+    fourth = io.StringIO()
+    generate_Batch("Medium", 5, fourth, workers=3, seed=3)  # the default chunk is split across the workers
+    lines = first.getvalue().splitlines()
+    assert first.getvalue() == second.getvalue() == third.getvalue() == fourth.getvalue()
+    assert len(lines) == 5
+    for line in lines:
+        puzzle, solution = line.split(",")
+        assert len(puzzle) == len(solution) == 81
+        assert puzzle.count(".") >= 31
+        assert all(p in (".", s) for p, s in zip(puzzle, solution))
+
+def test_seeded_Puzzle():
+    random.seed(1)
+    first = make_Puzzle("Hard", seed=42)
+    random.seed(2)
+    assert make_Puzzle("Hard", seed=42) == first
+    assert make_Puzzle("Hard", seed=43) != first
+    assert make_Puzzle("Easy", seed=42) != first
+    solution, puzzle, location = first
+    assert grade_Puzzle(puzzle)["level"] == "Hard" and count_Solutions(puzzle) == 1
+    assert load_Puzzle("Hard", 42) == first
+    load_Puzzle("Hard", 42)[1][0][0] = 0  # callers get copies, never the cached grids
+    assert load_Puzzle("Hard", 42) == first
+    large = make_Puzzle("Medium", box=4, seed="abc")
+    assert large == make_Puzzle("Medium", box=4, seed="abc")
+    assert len(large[2]) >= 98 and count_Solutions(large[1]) == 1
+
+def test_symmetry():
+    assert len(line_Orders(3)) == len(set(line_Orders(3))) == 1296
+    rng = random.Random(4)
+    solution, puzzle, location = make_Puzzle("Hard", seed=9)
+    key = canonical_Key(puzzle)
+    variants = [transform_Puzzle(solution, puzzle, rng) for _ in range(10)]
+    assert len({format_Grid(grid) for (_, grid, _) in variants}) == 10
+    for (data, grid, blanks) in variants:
+        assert Board(data).rows == [Board(data).full] * 9
+        assert solve(grid)[0] == data and count_Solutions(grid) == 1
+        assert len(blanks) == len(location) and all(grid[r][c] is None for (r, c) in blanks)
+        assert grade_Puzzle(grid)["hardest"] == grade_Puzzle(puzzle)["hardest"]
+        assert canonical_Key(grid) == canonical_Key(parse_Line(format_Grid(grid))) == key
+    assert canonical_Key(solution) == canonical_Key(variants[0][0])
+    assert canonical_Key(make_Puzzle("Hard", seed=10)[1]) != key
+    large = make_Puzzle("Easy", box=4, seed=1)
+    data, grid, blanks = transform_Puzzle(large[0], large[1], rng)
+    assert Board(data).rows == [Board(data).full] * 16 and count_Solutions(grid) == 1
+    with pytest.raises(ValueError):
+        canonical_Key(grid)
+
+def test_Profile(tmp_path, capsys):
+    make_Puzzle("Easy", seed=1)
+    assert report_Profile() == {"counters": {}, "phases": {}}  # nothing is recorded while disabled
+    start_Profile(str(tmp_path / "run.prof"))
+    solution, puzzle, location = make_Puzzle("Medium", seed=1)
+    solve(puzzle)
+    report = stop_Profile()
+    for phase in ("make_Puzzle", "generate_Sudoku", "remove_Clues", "grade_Puzzle", "count_Solutions", "solve"):
+        assert report["phases"][phase]["count"] >= 1
+    counters = report["counters"]
+    assert counters["generate_Sudoku.depth"] == 81 and counters["generate_Sudoku.nodes"] >= 81
+    assert counters["remove_Clues.attempts"] >= counters["remove_Clues.blanks"] >= 31
+    assert counters["solve.nodes"] >= 1
+    assert pstats.Stats(str(tmp_path / "run.prof")).total_calls > 0
+    make_Puzzle("Easy", seed=2)
+    assert report_Profile() == report
+
+    command_Line(["--profile"], play=lambda renderer, box: make_Puzzle("Easy", seed=1))
+    err = capsys.readouterr().err
+    assert "make_Puzzle" in err and "remove_Clues.attempts" in err
+
+def test_board_format(tmp_path):
+    line = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+    raw = parse_Line(line)
+    assert len(raw) == 81 and raw[:3] == bytes([5, 3, 0])
+    assert format_Line(raw) == line
+    assert unpack_Grid(raw) == data
+    assert pack_Grid(data) == raw
+    assert parse_Line(line.replace(".", "0") + ",solution") == raw
+    assert len(pack_Nibbles(raw)) == 41
+    assert unpack_Nibbles(pack_Nibbles(raw)) == raw
+    assert Board(raw).to_bytes() == raw
+    assert solve(raw)[0] == pack_Grid(solve(data)[0])
+    grid = bytearray(raw)
+    assert generate_Sudoku(grid) and bytes(grid) == solve(raw)[0]
+    grid = bytearray(256)
+    assert generate_Sudoku(grid) and 0 not in grid
+    board = Board(grid)
+    assert all(mask == board.full for mask in board.rows + board.cols + board.boxes)
+    with pytest.raises(TypeError):
+        generate_Sudoku(raw)
+
+    path = tmp_path / "puzzles.txt"
+    with open(path, "wb") as file:
+        assert write_Puzzles(file, [raw, raw]) == 2
+    assert list(read_Puzzles(path)) == [raw, raw]
+    assert list(read_Puzzles(path, use_mmap=True)) == [raw, raw]
+
+def test_verify_Batch(tmp_path):
+    path = tmp_path / "puzzles.txt"
+    path.write_text("53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79\n"
+                    "# comment\n"
+                    + "." * 81 + "\n"
+                    + "55" + "." * 79 + "\n"
+                    + "not a puzzle\n")
+    output = io.StringIO()
+    summary = verify_Batch(path, output, workers=1, chunk=2)
+    lines = [line.split(",") for line in output.getvalue().splitlines()]
+    assert [line[2] for line in lines] == ["1", "2", "0", "-1"]
+    assert lines[0][1] == format_Line(pack_Grid(solve(data)[0]))
+    assert lines[2][1] == "-"
+    assert summary["unique"] == summary["multiple"] == summary["unsolvable"] == summary["invalid"] == 1
+    assert summary["latency"].count == 3
+    assert summary["latency"].percentile(50) <= summary["latency"].percentile(99)
+
+def test_validate_Boards():
+    numpy = pytest.importorskip("numpy")
+    solution = solve(data)[0]
+    boards = numpy.array([solution] * 4, dtype=numpy.uint8)
+    boards[1, 4, 5] = boards[1, 4, 6]
+    boards[2, 0, 0] = 0
+    boards[3, 8, 8] = 12
+    valid, first = validate_Boards(boards)
+    assert valid.tolist() == [True, False, False, False]
+    assert first[0].tolist() == [-1, -1] and first[2].tolist() == [0, 0] and first[3].tolist() == [8, 8]
+    row, col = first[1]
+    assert boards[1, row, col] == boards[1, 4, 5] and (row, col) <= (4, 5)
+    assert validate_Boards(boards, allow_empty=True)[0].tolist() == [True, False, True, False]
+    result = compare_Boards(boards, solution)
+    assert result["complete"].tolist() == [True, False, False, False]
+    assert result["wrong"].tolist() == [0, 1, 0, 1] and result["empty"].tolist() == [0, 0, 1, 0]
+    assert result["first_wrong"][1].tolist() == [4, 5]
+    empty = numpy.zeros((0, 9, 9), dtype=numpy.uint8)
+    valid, first = validate_Boards(empty)
+    assert valid.shape == (0,) and first.shape == (0, 2)
+    assert compare_Boards(empty, solution)["first_wrong"].shape == (0, 2)
+
+def test_grade_Puzzle():
+    grade = grade_Puzzle(data)
+    assert grade["level"] == "Easy"
+    assert grade["techniques"] == {"hidden single": 51}
+
+    grade = grade_Puzzle(parse_Line("4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"))
+    assert grade["hardest"] == "locked candidates" and grade["level"] == "Hard"
+    assert grade["guesses"] == 0
+
+    grade = grade_Puzzle(parse_Line("8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."))
+    assert grade["level"] == "Expert" and grade["guesses"] > 0
+
+    solution, puzzle, location = make_Puzzle("Medium")
+    assert grade_Puzzle(puzzle)["level"] == "Medium"
+    assert grade_Puzzle(make_Puzzle("Hard", seed=91)[1])["level"] == "Hard"  # its first grid grades Expert
+    assert len(location) >= 31
+    assert count_Solutions(puzzle) == 1
+
+def test_GameState():
+    solution = solve(data)[0]
+    location = [(r,c) for r in range(9) for c in range(9) if data[r][c] is None]
+    state = GameState(solution, data, location)
+    assert state.counts[5] == sum(row.count(5) for row in data)
+    assert (state.correct, state.progress(), state.conflicts, state.wrong) == (0, 0, set(), set())
+
+    state.set(0, 2, 5)
+    assert state.conflicts == {(0,0), (0,2)}
+    assert state.wrong == {(0,2)}
+    state.set(0, 2, 4)
+    assert state.conflicts == set() and state.wrong == set()
+    assert state.correct == 1 and state.counts[5] == sum(row.count(5) for row in data)
+
+    state.reveal(0, 3)
+    assert (0,3) not in state.blanks and state.correct == 1
+    for (r,c) in location:
+        state.set(r, c, solution[r][c])
+    assert state.is_complete() and state.progress() == 100
+    assert all(state.is_used_up(n) for n in range(1,10))
+
+def test_deduce():
+    puzzle = unpack_Grid(parse_Line("4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"))
+    solution = solve(puzzle)[0]
+    location = [(r,c) for r in range(9) for c in range(9) if puzzle[r][c] is None]
+    state = GameState(solution, puzzle, location)
+    r, c = location[0]
+    state.set(r, c, solution[r][c] % 9 + 1)
+    deduction = state.deduce()
+    assert deduction["technique"] == "mistake" and deduction["cells"] == [(r, c)]
+    state.set(r, c, None)
+
+    techniques = set()
+    while not state.is_complete():
+        start = time.perf_counter()
+        deduction = state.deduce()
+        assert time.perf_counter() - start < 0.016
+        assert deduction is not None and deduction["text"]
+        techniques.add(deduction["technique"])
+        assert all(solution[r][c] != n for (r, c, n) in deduction["eliminate"])
+        if deduction["place"] is not None:
+            r, c, n = deduction["place"]
+            assert n == solution[r][c]
+            state.set(r, c, n)
+        for r in range(9):
+            for c in range(9):
+                used = {state.player[rr][cc] for (rr, cc) in geometry(3)["peers"][r][c]}
+                expected = 0 if state.player[r][c] else sum(1 << n for n in range(1, 10) if n not in used)
+                assert state.candidates[r*9 + c] == expected
+    assert "locked candidates" in techniques
+    assert GameState(*make_Puzzle("Easy", box=4)).deduce() is None
+
+    state = GameState(solve(data)[0], data, [(r,c) for r in range(9) for c in range(9) if data[r][c] is None])
+    deduction = find_Deduction([n or 0 for row in data for n in row], state.candidates)
+    assert deduction["technique"] == "hidden single" and deduction["place"] is not None
+    assert deduction["text"] == "8 fits only r1c6 in box 2."
+
+def test_hint():
+    puzzle = unpack_Grid(parse_Line("4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"))
+    solution = solve(puzzle)[0]
+    location = [(r,c) for r in range(9) for c in range(9) if puzzle[r][c] is None]
+    state = GameState(solution, puzzle, location)
+    r, c = location[0]
+    state.set(r, c, solution[r][c] % 9 + 1)
+    state.set(*location[-1], solution[location[-1][0]][location[-1][1]] % 9 + 1)
+    deduction, cell = state.hint((r, c))
+    assert deduction["technique"] == "mistake" and cell is None  # nothing is revealed
+    assert deduction["cells"] == [(r, c)]  # one wrong cell per hint
+    state.set(r, c, None)
+    state.set(*location[-1], None)
+
+    charged = free = 0
+    while not state.is_complete():
+        deduction, cell = state.hint()
+        if cell is None:
+            assert deduction["eliminate"] and deduction["place"] is None
+            free += 1
+        else:
+            assert cell == deduction["place"][:2]
+            state.reveal(*cell)
+            charged += 1
+    assert charged == len(location) and free > 0 and state.hinted == set(location)
+
+    solution, puzzle, location = make_Puzzle("Easy", box=4, seed=1)
+    state = GameState(solution, puzzle, location)
+    assert state.hint(location[3]) == (None, location[3])
+    deduction, cell = state.hint(None, random.Random(5))
+    assert deduction is None and cell in location
+    state.reveal(*cell)
+    assert state.hint(cell)[1] != cell
+
+def test_Session(tmp_path):
+    solution = solve(data)[0]
+    location = [(r,c) for r in range(9) for c in range(9) if data[r][c] is None]
+    state = GameState(solution, data, location)
+    state.play(0, 2, 5)
+    state.play(0, 2, 4)
+    state.reveal(0, 3)
+    state.play(8, 0, 1)
+    assert state.undo()[:3] == (8, 0, None)
+    assert state.undo() is None
+    assert state.player[0][2] == 4 and state.future
+
+    raw = save_Session(state, "Hard", 1, 2)
+    assert len(raw) == 119 + 3 * 4
+    session = load_Session(raw)
+    restored = session["state"]
+    assert (session["level"], session["hint"], session["mistake"]) == ("Hard", 1, 2)
+    assert session["puzzle"] == data and restored.player == state.player
+    assert restored.blanks == state.blanks and restored.hinted == {(0, 3)}
+    assert (restored.correct, restored.wrong, restored.conflicts) == (state.correct, state.wrong, state.conflicts)
+    assert restored.redo()[:3] == (8, 0, 1)
+
+    write_Sessions(str(tmp_path / "sessions"), {"a": raw, "b": save_Session(restored, "Easy", 3, 0)})
+    sessions = read_Sessions(str(tmp_path / "sessions"))
+    assert sessions["a"] == raw and load_Session(sessions["b"])["state"].player[8][0] == 1
+    assert read_Sessions(str(tmp_path / "missing")) == {}
+    store = (tmp_path / "sessions").read_bytes()
+    for corrupt in (store[:-1], store[:2], b"\x02\xff\xfe\x00\x00"):
+        (tmp_path / "sessions").write_bytes(corrupt)
+        with pytest.raises(ValueError):
+            read_Sessions(str(tmp_path / "sessions"))
+    with pytest.raises(ValueError, match="too long"):
+        write_Sessions(str(tmp_path / "sessions"), {"a": raw * 600})
+    assert (tmp_path / "sessions").read_bytes() == corrupt  # left untouched
+    restored.history = [0] * 0x10000
+    with pytest.raises(ValueError, match="too long"):
+        save_Session(restored, "Easy", 3, 0)
+    with pytest.raises(ValueError):
+        load_Session(b"not a snapshot at all")
+    for length in (20, 60, 100, len(raw) - 1, len(raw) + 1):
+        with pytest.raises(ValueError, match="expected 131"):
+            load_Session((raw + b"\0")[:length])
+    with pytest.raises(ValueError, match="corrupt"):
+        load_Session(raw[:-3] + (81 | 5 << 15).to_bytes(3, "little"))
+
+def test_PuzzleServer():
+    async def session():
+        server = PuzzleServer(workers=1, batch=2)
+        listener = await server.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", listener.sockets[0].getsockname()[1])
+        try:
+            status, puzzle = await fetch(reader, writer, "GET", "/puzzle?level=Easy")
+            assert status == 200 and len(puzzle["puzzle"]) == 81
+            status, bulk = await fetch(reader, writer, "GET", "/puzzle?level=Medium&count=3&seed=7")
+            assert status == 200 and [entry["seed"] for entry in bulk["puzzles"]] == [7, 8, 9]
+            assert [entry["puzzle"] for entry in bulk["puzzles"]] == [
+                format_Grid(load_Puzzle("Medium", seed)[1]) for seed in (7, 8, 9)]
+            status, solved = await fetch(reader, writer, "POST", "/solve", {"puzzle": puzzle["puzzle"]})
+            assert status == 200 and solved["count"] == 1
+            wrong = "".join("9" if ch == "." and i == puzzle["puzzle"].index(".") else ch
+                            for i, ch in enumerate(puzzle["puzzle"]))
+            status, check = await fetch(reader, writer, "POST", "/check", {"id": puzzle["id"], "board": wrong})
+            first = puzzle["puzzle"].index(".")
+            assert check["complete"] is False
+            assert check["wrong"] == ([] if solved["solution"][first] == "9" else [[first // 9, first % 9]])
+            status, hint = await fetch(reader, writer, "POST", "/hint", {"id": puzzle["id"], "cell": [first // 9, first % 9]})
+            assert hint["cell"] == [first // 9, first % 9] and hint["value"] == int(solved["solution"][first])
+            status, check = await fetch(reader, writer, "POST", "/check", {"id": puzzle["id"], "board": solved["solution"]})
+            assert check["complete"] is True and check["progress"] == 100
+            assert (await fetch(reader, writer, "POST", "/check", {"id": "missing"}))[0] == 404
+            assert (await fetch(reader, writer, "GET", "/puzzle?level=Impossible"))[0] == 400
+            for cell in (10, -1, "x", True):
+                board = [[None] * 9 for _ in range(9)]
+                board[4][4] = cell
+                status, error = await fetch(reader, writer, "POST", "/check", {"id": puzzle["id"], "board": board})
+                assert status == 400 and error["error"] == "the cells of a board are null or digits from 0 to 9"
+            async def broken(query, body):
+                return [][0]
+            server.post_Check = broken  # any bug in a handler answers 500
+            assert (await fetch(reader, writer, "POST", "/check", {"id": puzzle["id"]})) == (500, {"error": "internal server error"})
+            async def missing_key(query, body):
+                return {}["key"]
+            server.post_Check = missing_key  # not reported as an unknown puzzle
+            assert (await fetch(reader, writer, "POST", "/check", {"id": puzzle["id"]}))[0] == 500
+            status, metrics = await fetch(reader, writer, "GET", "/metrics")
+            assert metrics["/puzzle"]["count"] == 3 and metrics["/check"]["count"] == 9
+            assert metrics["failures"] == 2
+            for request in (b"GARBAGE\r\n\r\n", b"GET /metrics HTTP/1.1\r\nno colon\r\n\r\n",
+                            b"POST /check HTTP/1.1\r\nContent-Length: ten\r\n\r\n",
+                            b"POST /check HTTP/1.1\r\nContent-Length: -5\r\n\r\n"):
+                raw_reader, raw_writer = await asyncio.open_connection("127.0.0.1", listener.sockets[0].getsockname()[1])
+                raw_writer.write(request)
+                response = await raw_reader.read()  # the server closes the connection after answering
+                raw_writer.close()
+                assert response.startswith(b"HTTP/1.1 400 ") and b"Connection: close" in response
+        finally:
+            writer.close()
+            await server.stop()
+    asyncio.run(session())